@@ -12,6 +12,7 @@ from .const import (CONF_DARK_MODE, CONF_LANGUAGE_OVERRIDE, CONF_STYLE,
                     CONF_USE_DEPRECATED_FORECAST, CONFIG_FLOW_VERSION, DOMAIN,
                     OPTION_DEPRECATED_FORECAST_NOT_USED, PLATFORMS)
 from .coordinator import IrmKmiCoordinator
+from .store import IrmKmiSnapshotStore
 from .weather import IrmKmiWeather
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,13 +25,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # When integration is set up, set the logging level of the irm_kmi_api package to the same level to help debugging
     logging.getLogger('irm_kmi_api').setLevel(_LOGGER.getEffectiveLevel())
-    try:
-        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-        await coordinator.async_config_entry_first_refresh()
-    except ConfigEntryError:
-        # This happens when the zone is out of Benelux (no forecast available there)
-        # This should be caught by the config flow anyway
-        return False
+
+    if await coordinator.async_restore_data():
+        # Entities start with the data saved before the restart, fresh data is fetched in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}")
+    else:
+        try:
+            # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryError:
+            # This happens when the zone is out of Benelux (no forecast available there)
+            # This should be caught by the config flow anyway
+            return False
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -45,6 +51,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the data saved for the entry when it is removed."""
+    await IrmKmiSnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
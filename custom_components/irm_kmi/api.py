@@ -0,0 +1,294 @@
+"""API client sending conditional requests and honoring Cache-Control"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import re
+import socket
+import time
+import urllib.parse
+from typing import Any, Dict, Tuple, TypedDict
+
+import aiohttp
+import async_timeout
+from irm_kmi_api.api import (IrmKmiApiClientHa, IrmKmiApiCommunicationError,
+                             IrmKmiApiError)
+
+from .breaker import IrmKmiCircuitBreaker
+from .hedging import IrmKmiHedger
+from .scheduler import IrmKmiRateLimiter
+from .singleflight import IrmKmiSingleFlight, forecast_key
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+# Priority of the requests by kind of resource when they wait for the rate limiter: forecast and warnings first, then
+# radar images and pollen
+_PRIORITIES: Dict[str, int] = {'forecast': 0}
+_LOW_PRIORITY = 1
+
+
+class HttpCacheEntry(TypedDict, total=False):
+    """Last response received for a URL, with its validators"""
+
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fresh_until: float
+    last_used: float
+    parsed: Any
+
+
+class IrmKmiConditionalApiClient(IrmKmiApiClientHa):
+    """API client that keeps the last response of each request and its validators (ETag and Last-Modified).
+
+    Requests are sent with If-None-Match/If-Modified-Since so that the server can answer 304 Not Modified, and are not
+    sent at all while the previous response is still fresh according to its Cache-Control max-age.  When the forecast
+    did not change, the previously parsed forecast is returned as is.  When a single-flight layer is given, forecasts
+    requested at the same time by other clients for the same location are shared.  When a rate limiter is given,
+    requests wait for it before being sent, forecasts (with the warnings) first.  When a circuit breaker is given,
+    requests to a host that keeps failing are not sent.  When a hedger is given, forecast requests slower than usual
+    are sent a second time and the first response is used.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, user_agent: str, cdt_map: dict,
+                 single_flight: IrmKmiSingleFlight | None = None,
+                 rate_limiter: IrmKmiRateLimiter | None = None,
+                 circuit_breaker: IrmKmiCircuitBreaker | None = None,
+                 hedger: IrmKmiHedger | None = None) -> None:
+        super().__init__(session, user_agent, cdt_map)
+        self._single_flight = single_flight
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._hedger = hedger
+        self._http_cache: Dict[str, HttpCacheEntry] = dict()
+        # Number of requests, responses not modified or still fresh and bytes downloaded, by kind of resource
+        self.http_stats: Dict[str, Dict[str, int]] = dict()
+        self._section_digests: Dict[str, str] = dict()
+        self._section_digests_of: dict | None = None
+
+    async def get_forecasts_coord(self, coord: Dict[str, float | int]) -> dict:
+        """
+        Get forecasts for given location.  The forecast is only parsed when it changed since the last request.
+
+        :param coord: dict with the following keys: 'lat', 'long' (both float or int)
+        :return: raw forecast as python dict
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        assert 'lat' in coord
+        assert 'long' in coord
+        coord['lat'] = round(coord['lat'], self.COORD_DECIMALS)
+        coord['long'] = round(coord['long'], self.COORD_DECIMALS)
+
+        if self._single_flight is not None:
+            return await self._single_flight.async_call(forecast_key(coord['lat'], coord['long']),
+                                                        lambda: self._get_forecasts_coord(coord))
+        return await self._get_forecasts_coord(coord)
+
+    async def _get_forecasts_coord(self, coord: Dict[str, float | int]) -> dict:
+        entry = await self._cached_request(
+            params={"s": "getForecasts", "k": self._api_key("getForecasts")} | coord,
+            resource='forecast'
+        )
+        if entry.get('parsed') is None:
+            entry['parsed'] = json.loads(entry['body'])
+            _LOGGER.debug(f"Full data: {entry['parsed']}")
+
+        return entry['parsed']
+
+    async def get_image(self, url, params: Dict[str, str] | None = None) -> bytes:
+        """
+        Get the image at the specified url with the parameters
+
+        :param url: URL to fetch
+        :param params: query parameters to add to the request
+        :return: response body as bytes
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        entry = await self._cached_request({} if params is None else params, base_url=url, resource='image')
+        return entry['body']
+
+    async def get_svg(self, url, params: Dict[str, str] | None = None) -> str:
+        """
+        Get SVG as str at the specified url with the parameters
+
+        :param url: URL to fetch
+        :param params: query parameters to add to the request
+        :return: request body decoded as utf-8 str
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        entry = await self._cached_request({} if params is None else params, base_url=url, resource='svg')
+        return entry['body'].decode()
+
+    def get_forecast_data(self) -> dict:
+        """Get the raw forecast we currently have, to share it with other clients"""
+        return self._api_data
+
+    def set_forecast_data(self, data: dict) -> None:
+        """Use a raw forecast received by another client as if this client had fetched it"""
+        self._api_data = data
+
+    def get_pollen_url(self) -> str | None:
+        """Get the URL of the pollen SVG for the forecast we currently have, None if there is none"""
+        for module in self._api_data.get('module', []):
+            if module.get('type', None) == 'svg':
+                url = module.get('data', {}).get('url', {}).get('en', '')
+                if 'pollen' in url:
+                    return url
+        return None
+
+    def get_section_digests(self) -> Dict[str, str]:
+        """
+        Content hash of each section of the forecast we currently have: one per top level key, except 'for' which
+        has one per sub key ('for.daily', 'for.hourly', 'for.warning'...).  Computed once per forecast received.
+
+        :return: dict mapping the name of the section to its hash
+        """
+        if self._section_digests_of is not self._api_data:
+            forecasts = self._api_data.get('for', {})
+            sections = {k: v for k, v in self._api_data.items() if k != 'for'}
+            if isinstance(forecasts, dict):
+                sections |= {f"for.{k}": v for k, v in forecasts.items()}
+            self._section_digests = {
+                name: hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+                for name, value in sections.items()
+            }
+            self._section_digests_of = self._api_data
+        return self._section_digests
+
+    def expire_cache(self) -> None:
+        """Expire the responses which have not been used since self._cache_max_age (default 2h)"""
+        super().expire_cache()
+        now = time.monotonic()
+        self._http_cache = {key: entry for key, entry in self._http_cache.items()
+                            if now - entry['last_used'] <= self._cache_max_age}
+
+    async def _api_wrapper(
+            self,
+            params: dict,
+            base_url: str | None = None,
+            path: str = "",
+            method: str = "get",
+            data: dict | None = None,
+            headers: dict | None = None,
+    ) -> bytes:
+        """Get information from the API, using the last response if it did not change."""
+        if method.lower() != 'get':
+            return await super()._api_wrapper(params, base_url, path, method, data, headers)
+
+        entry = await self._cached_request(params, base_url, path, headers)
+        return entry['body']
+
+    async def _cached_request(
+            self,
+            params: dict,
+            base_url: str | None = None,
+            path: str = "",
+            headers: dict | None = None,
+            resource: str = 'other'
+    ) -> HttpCacheEntry:
+        """
+        Send a GET request unless the previous response is still fresh, conditional if validators are known.
+
+        :param resource: kind of resource requested, for the statistics
+
+        :return: cache entry of the response, with the response body
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        url = f"{self._base_url if base_url is None else base_url}{path}"
+        key = f"{url}?{urllib.parse.urlencode(sorted(params.items()))}"
+        now = time.monotonic()
+
+        stats = self.http_stats.setdefault(resource, {'requests': 0, 'not_modified': 0, 'fresh': 0, 'bytes': 0})
+
+        entry = self._http_cache.get(key)
+        if entry is not None and now < entry['fresh_until']:
+            _LOGGER.debug(f"Still fresh, not requesting {url}")
+            stats['fresh'] += 1
+            entry['last_used'] = now
+            return entry
+
+        headers = dict() if headers is None else headers
+        headers['User-Agent'] = self._user_agent
+        if entry is not None and entry.get('etag') is not None:
+            headers['If-None-Match'] = entry['etag']
+        if entry is not None and entry.get('last_modified') is not None:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        cached = entry
+        if resource == 'forecast' and self._hedger is not None:
+            response, entry = await self._hedger.async_call(
+                lambda: self._send_request(url, params, headers, cached, resource))
+        else:
+            response, entry = await self._send_request(url, params, headers, cached, resource)
+
+        entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+        entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+        entry['fresh_until'] = now + _max_age(response.headers)
+        entry['last_used'] = now
+
+        if entry['etag'] is not None or entry['last_modified'] is not None or entry['fresh_until'] > now:
+            self._http_cache[key] = entry
+        return entry
+
+    async def _send_request(
+            self,
+            url: str,
+            params: dict,
+            headers: dict,
+            entry: HttpCacheEntry | None,
+            resource: str
+    ) -> Tuple[aiohttp.ClientResponse, HttpCacheEntry]:
+        """
+        Send the GET request, through the circuit breaker and the rate limiter when they are given.
+
+        :return: tuple (response, cache entry with the response body, the given entry if not modified)
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        stats = self.http_stats[resource]
+        guard = contextlib.nullcontext() if self._circuit_breaker is None \
+            else self._circuit_breaker.guard(urllib.parse.urlsplit(url).netloc)
+
+        try:
+            with guard:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.async_acquire(_PRIORITIES.get(resource, _LOW_PRIORITY))
+
+                async with async_timeout.timeout(60):
+                    stats['requests'] += 1
+                    response = await self._session.request(method="get", url=url, headers=headers, params=params)
+                    response.raise_for_status()
+
+                    if response.status == 304 and entry is not None:
+                        _LOGGER.debug(f"Not modified: {url}")
+                        stats['not_modified'] += 1
+                    else:
+                        entry = HttpCacheEntry(body=await response.read(), parsed=None)
+                        stats['bytes'] += len(entry['body'])
+
+        except IrmKmiApiError:
+            raise
+        except asyncio.TimeoutError as exception:
+            raise IrmKmiApiCommunicationError("Timeout error fetching information") from exception
+        except (aiohttp.ClientError, socket.gaierror) as exception:
+            raise IrmKmiApiCommunicationError("Error fetching information") from exception
+        except Exception as exception:  # pylint: disable=broad-except
+            raise IrmKmiApiError(f"Something really wrong happened! {exception}") from exception
+
+        return response, entry
+
+
+def _max_age(headers) -> float:
+    """Number of seconds the response can be used without asking the server again, according to Cache-Control"""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+    if (match := _MAX_AGE.search(cache_control)) is None:
+        return 0
+    try:
+        age = float(headers.get('Age', 0))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
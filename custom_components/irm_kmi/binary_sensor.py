@@ -7,10 +7,10 @@ from homeassistant.components.binary_sensor import (BinarySensorDeviceClass,
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt
 
 from . import DOMAIN, IrmKmiCoordinator
+from .entity import IrmKmiCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,7 +21,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities([IrmKmiWarning(coordinator, entry)])
 
 
-class IrmKmiWarning(CoordinatorEntity, BinarySensorEntity):
+class IrmKmiWarning(IrmKmiCoordinatorEntity, BinarySensorEntity):
     """Representation of a weather warning binary sensor"""
 
     _attr_attribution = "Weather data from the Royal Meteorological Institute of Belgium meteo.be"
@@ -50,14 +50,12 @@ class IrmKmiWarning(CoordinatorEntity, BinarySensorEntity):
 
         return False
 
-    @property
-    def extra_state_attributes(self) -> dict:
+    def _extra_attributes(self) -> dict:
         """Return the warning sensor attributes."""
-        attrs = {"warnings": self.coordinator.data.get('warnings', [])}
-
         now = dt.now()
-        for warning in attrs['warnings']:
-            warning['is_active'] = warning.get('starts_at') < now < warning.get('ends_at')
+        # Copies: the warnings of the coordinator are shared with the last state written
+        attrs = {"warnings": [warning | {'is_active': warning.get('starts_at') < now < warning.get('ends_at')}
+                              for warning in self.coordinator.data.get('warnings', [])]}
 
         attrs["active_warnings_friendly_names"] = ", ".join([warning['friendly_name'] for warning in attrs['warnings']
                                                              if warning['is_active'] and warning['friendly_name'] != ''])
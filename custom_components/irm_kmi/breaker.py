@@ -0,0 +1,123 @@
+"""Stop sending requests to an API host that keeps failing, and probe it again later"""
+import asyncio
+import logging
+import random
+import socket
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from irm_kmi_api.api import IrmKmiApiCommunicationError
+
+from .const import (BREAKER_BACKOFF_JITTER, BREAKER_FAILURE_THRESHOLD,
+                    BREAKER_MAX_BACKOFF, BREAKER_MIN_BACKOFF,
+                    DATA_CIRCUIT_BREAKER)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiCircuitOpenError(IrmKmiApiCommunicationError):
+    """Raised instead of sending a request to a host that failed too many times recently"""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"Too many errors from {host}, not sending requests for {retry_in:.0f} seconds")
+        self.retry_in = retry_in
+
+
+class _HostState:
+    """Consecutive failures of a host and when it may be probed again (None while the circuit is closed)"""
+
+    def __init__(self) -> None:
+        self.failures: int = 0
+        self.opened: int = 0
+        self.retry_at: float | None = None
+        self.probing: bool = False
+
+
+class IrmKmiCircuitBreaker:
+    """Process-wide circuit breaker, per API host, shared by all the config entries.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures (timeouts, connection errors, server errors), the circuit of
+    the host opens: requests fail right away without reaching the network.  When the backoff is over, a single request
+    is let through (half-open).  If it succeeds the circuit closes and requests are sent normally, otherwise the
+    backoff doubles (with jitter) up to BREAKER_MAX_BACKOFF.
+    """
+
+    def __init__(self) -> None:
+        self._hosts: Dict[str, _HostState] = dict()
+
+    def retry_in(self, host: str) -> float:
+        """Seconds until requests to the host are allowed again, 0 if they are allowed now"""
+        state = self._hosts.get(host)
+        if state is None or state.retry_at is None:
+            return 0
+        return max(state.retry_at - time.monotonic(), 0)
+
+    @contextmanager
+    def guard(self, host: str) -> Iterator[None]:
+        """
+        Context manager around a request to the host: records the outcome of the request.
+
+        :raise: IrmKmiCircuitOpenError when the circuit of the host is open
+        """
+        self._before_request(host)
+        try:
+            yield
+        except aiohttp.ClientResponseError as err:
+            # Client errors (e.g. missing image) show that the host is up
+            if err.status >= 500 or err.status == 429:
+                self._record_failure(host)
+            else:
+                self._record_success(host)
+            raise
+        except (asyncio.TimeoutError, aiohttp.ClientError, socket.gaierror):
+            self._record_failure(host)
+            raise
+        except BaseException:
+            self._release_probe(host)
+            raise
+        else:
+            self._record_success(host)
+
+    def _before_request(self, host: str) -> None:
+        state = self._hosts.get(host)
+        if state is None or state.retry_at is None:
+            return
+
+        if state.probing or time.monotonic() < state.retry_at:
+            raise IrmKmiCircuitOpenError(host, self.retry_in(host))
+
+        _LOGGER.debug(f"Probing {host} after {state.failures} failures")
+        state.probing = True
+
+    def _record_success(self, host: str) -> None:
+        if (state := self._hosts.pop(host, None)) is not None and state.retry_at is not None:
+            _LOGGER.info(f"Requests to {host} succeed again, resuming normal polling")
+
+    def _record_failure(self, host: str) -> None:
+        state = self._hosts.setdefault(host, _HostState())
+        state.failures += 1
+        state.probing = False
+
+        if state.retry_at is not None or state.failures >= BREAKER_FAILURE_THRESHOLD:
+            state.opened += 1
+            backoff = min(BREAKER_MIN_BACKOFF.total_seconds() * 2 ** (state.opened - 1),
+                          BREAKER_MAX_BACKOFF.total_seconds())
+            backoff *= random.uniform(1 - BREAKER_BACKOFF_JITTER, 1 + BREAKER_BACKOFF_JITTER)
+            state.retry_at = time.monotonic() + backoff
+            _LOGGER.warning(f"{state.failures} consecutive errors from {host}, not sending requests for "
+                            f"{backoff:.0f} seconds")
+
+    def _release_probe(self, host: str) -> None:
+        """The probe was cancelled before knowing if the host is back: let another request probe it"""
+        if (state := self._hosts.get(host)) is not None:
+            state.probing = False
+
+
+@singleton(DATA_CIRCUIT_BREAKER)
+def get_circuit_breaker(hass: HomeAssistant) -> IrmKmiCircuitBreaker:
+    """Get the circuit breaker shared by all the config entries"""
+    return IrmKmiCircuitBreaker()
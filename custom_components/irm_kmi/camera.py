@@ -7,10 +7,10 @@ from homeassistant.components.camera import Camera, async_get_still_stream
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import IrmKmiCoordinator
 from .const import DOMAIN
+from .entity import IrmKmiCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,10 +22,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities([IrmKmiRadar(coordinator, entry)])
 
 
-class IrmKmiRadar(CoordinatorEntity, Camera):
+class IrmKmiRadar(IrmKmiCoordinatorEntity, Camera):
     """Representation of a radar view camera."""
 
     _attr_attribution = "Weather data from the Royal Meteorological Institute of Belgium meteo.be"
+    _datasets = ('animation',)
 
     def __init__(self,
                  coordinator: IrmKmiCoordinator,
@@ -79,10 +80,8 @@ class IrmKmiRadar(CoordinatorEntity, Camera):
         """Return the name of this camera."""
         return self._name
 
-    @property
-    def extra_state_attributes(self) -> dict:
+    def _extra_attributes(self) -> dict:
         """Return the camera state attributes."""
         rain_graph = self.coordinator.data.get('animation', None)
         hint = rain_graph.get_hint() if rain_graph is not None else None
-        attrs = {"hint": hint}
-        return attrs
+        return {"hint": hint}
@@ -8,21 +8,34 @@ from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, CONF_ZONE
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (EntitySelector,
                                             EntitySelectorConfig,
-                                            SelectSelector,
+                                            NumberSelector,
+                                            NumberSelectorConfig,
+                                            NumberSelectorMode, SelectSelector,
                                             SelectSelectorConfig,
                                             SelectSelectorMode)
 from irm_kmi_api.api import IrmKmiApiClient
 
 from . import OPTION_STYLE_STD
-from .const import (CONF_DARK_MODE, CONF_LANGUAGE_OVERRIDE,
-                    CONF_LANGUAGE_OVERRIDE_OPTIONS, CONF_STYLE,
+from .const import (CONF_DARK_MODE, CONF_FORECAST_DEADLINE,
+                    CONF_HEDGE_REQUESTS, CONF_LANGUAGE_OVERRIDE,
+                    CONF_LANGUAGE_OVERRIDE_OPTIONS, CONF_MAX_UPDATE_INTERVAL,
+                    CONF_MIN_UPDATE_INTERVAL, CONF_POLLEN_DEADLINE,
+                    CONF_RADAR_DEADLINE, CONF_RENDER_DEADLINE,
+                    CONF_RENDER_WORKERS, CONF_STALE_DATA_MAX_AGE, CONF_STYLE,
                     CONF_STYLE_OPTIONS, CONF_USE_DEPRECATED_FORECAST,
                     CONF_USE_DEPRECATED_FORECAST_OPTIONS, CONFIG_FLOW_VERSION,
-                    DOMAIN, OPTION_DEPRECATED_FORECAST_NOT_USED,
-                    OUT_OF_BENELUX, USER_AGENT)
+                    DEFAULT_FORECAST_DEADLINE, DEFAULT_MAX_UPDATE_INTERVAL,
+                    DEFAULT_MIN_UPDATE_INTERVAL, DEFAULT_POLLEN_DEADLINE,
+                    DEFAULT_RADAR_DEADLINE, DEFAULT_RENDER_DEADLINE,
+                    DEFAULT_STALE_DATA_MAX_AGE, DOMAIN,
+                    OPTION_DEPRECATED_FORECAST_NOT_USED, OUT_OF_BENELUX,
+                    RAIN_GRAPH_MAX_WORKERS, USER_AGENT,
+                    VALIDATED_FORECAST_MAX_AGE)
+from .geofence import is_out_of_benelux
+from .session import get_http_session
+from .singleflight import forecast_key, get_single_flight
 from .utils import get_config_value
 
 _LOGGER = logging.getLogger(__name__)
@@ -47,17 +60,25 @@ class IrmKmiConfigFlow(ConfigFlow, domain=DOMAIN):
             if (zone := self.hass.states.get(user_input[CONF_ZONE])) is None:
                 errors[CONF_ZONE] = 'zone_not_exist'
 
+            # Zones far from Benelux are rejected without asking the API
+            if not errors and is_out_of_benelux(zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE]):
+                errors[CONF_ZONE] = 'out_of_benelux'
+
             # Check if zone is in Benelux
             if not errors:
                 api_data = {}
                 try:
+                    # The forecast of the exact location is checked: it is kept for the first refresh of the
+                    # entry, right after the flow
+                    lat, long = zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE]
                     async with (async_timeout.timeout(60)):
-                        api_data = await IrmKmiApiClient(
-                            session=async_get_clientsession(self.hass),
-                            user_agent=USER_AGENT
-                        ).get_forecasts_coord(
-                            {'lat': zone.attributes[ATTR_LATITUDE],
-                             'long': zone.attributes[ATTR_LONGITUDE]}
+                        api_data = await get_single_flight(self.hass).async_call(
+                            forecast_key(lat, long),
+                            lambda: IrmKmiApiClient(
+                                session=get_http_session(self.hass).session,
+                                user_agent=USER_AGENT
+                            ).get_forecasts_coord({'lat': lat, 'long': long}),
+                            ttl=VALIDATED_FORECAST_MAX_AGE.total_seconds()
                         )
                 except Exception:
                     errors['base'] = "api_error"
@@ -139,7 +160,65 @@ class IrmKmiOptionFlow(OptionsFlow):
                                  default=get_config_value(self.current_config_entry, CONF_LANGUAGE_OVERRIDE)):
                         SelectSelector(SelectSelectorConfig(options=CONF_LANGUAGE_OVERRIDE_OPTIONS,
                                                             mode=SelectSelectorMode.DROPDOWN,
-                                                            translation_key=CONF_LANGUAGE_OVERRIDE))
+                                                            translation_key=CONF_LANGUAGE_OVERRIDE)),
+
+                    vol.Optional(CONF_STALE_DATA_MAX_AGE,
+                                 default=get_config_value(self.current_config_entry, CONF_STALE_DATA_MAX_AGE,
+                                                          DEFAULT_STALE_DATA_MAX_AGE)):
+                        NumberSelector(NumberSelectorConfig(min=0, max=24 * 60, step=1,
+                                                            unit_of_measurement="min",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_MIN_UPDATE_INTERVAL,
+                                 default=get_config_value(self.current_config_entry, CONF_MIN_UPDATE_INTERVAL,
+                                                          DEFAULT_MIN_UPDATE_INTERVAL)):
+                        NumberSelector(NumberSelectorConfig(min=3, max=60, step=1,
+                                                            unit_of_measurement="min",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_MAX_UPDATE_INTERVAL,
+                                 default=get_config_value(self.current_config_entry, CONF_MAX_UPDATE_INTERVAL,
+                                                          DEFAULT_MAX_UPDATE_INTERVAL)):
+                        NumberSelector(NumberSelectorConfig(min=3, max=60, step=1,
+                                                            unit_of_measurement="min",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_HEDGE_REQUESTS,
+                                 default=get_config_value(self.current_config_entry, CONF_HEDGE_REQUESTS, False)): bool,
+
+                    vol.Optional(CONF_RENDER_WORKERS,
+                                 default=get_config_value(self.current_config_entry, CONF_RENDER_WORKERS,
+                                                          RAIN_GRAPH_MAX_WORKERS)):
+                        NumberSelector(NumberSelectorConfig(min=1, max=8, step=1,
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_FORECAST_DEADLINE,
+                                 default=get_config_value(self.current_config_entry, CONF_FORECAST_DEADLINE,
+                                                          DEFAULT_FORECAST_DEADLINE)):
+                        NumberSelector(NumberSelectorConfig(min=1, max=300, step=1,
+                                                            unit_of_measurement="s",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_POLLEN_DEADLINE,
+                                 default=get_config_value(self.current_config_entry, CONF_POLLEN_DEADLINE,
+                                                          DEFAULT_POLLEN_DEADLINE)):
+                        NumberSelector(NumberSelectorConfig(min=1, max=300, step=1,
+                                                            unit_of_measurement="s",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_RADAR_DEADLINE,
+                                 default=get_config_value(self.current_config_entry, CONF_RADAR_DEADLINE,
+                                                          DEFAULT_RADAR_DEADLINE)):
+                        NumberSelector(NumberSelectorConfig(min=1, max=300, step=1,
+                                                            unit_of_measurement="s",
+                                                            mode=NumberSelectorMode.BOX)),
+
+                    vol.Optional(CONF_RENDER_DEADLINE,
+                                 default=get_config_value(self.current_config_entry, CONF_RENDER_DEADLINE,
+                                                          DEFAULT_RENDER_DEADLINE)):
+                        NumberSelector(NumberSelectorConfig(min=1, max=300, step=1,
+                                                            unit_of_measurement="s",
+                                                            mode=NumberSelectorMode.BOX))
                 }
             ),
         )
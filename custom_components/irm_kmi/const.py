@@ -1,4 +1,5 @@
 """Constants for the IRM KMI integration."""
+from datetime import timedelta
 from typing import Final
 
 from homeassistant.components.sensor import SensorDeviceClass
@@ -57,6 +58,27 @@ CONF_LANGUAGE_OVERRIDE_OPTIONS: Final = [
     'none', "fr", "nl", "de", "en"
 ]
 
+CONF_STALE_DATA_MAX_AGE: Final = 'stale_data_max_age'
+# In minutes
+DEFAULT_STALE_DATA_MAX_AGE: Final = 60
+
+CONF_MIN_UPDATE_INTERVAL: Final = 'min_update_interval'
+CONF_MAX_UPDATE_INTERVAL: Final = 'max_update_interval'
+# In minutes
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 5
+DEFAULT_MAX_UPDATE_INTERVAL: Final = 15
+
+# Deadline of each stage of a refresh.  A stage missing its deadline keeps its previous data.
+CONF_FORECAST_DEADLINE: Final = 'forecast_deadline'
+CONF_POLLEN_DEADLINE: Final = 'pollen_deadline'
+CONF_RADAR_DEADLINE: Final = 'radar_deadline'
+CONF_RENDER_DEADLINE: Final = 'render_deadline'
+# In seconds
+DEFAULT_FORECAST_DEADLINE: Final = 60
+DEFAULT_POLLEN_DEADLINE: Final = 20
+DEFAULT_RADAR_DEADLINE: Final = 30
+DEFAULT_RENDER_DEADLINE: Final = 20
+
 REPAIR_SOLUTION: Final = "repair_solution"
 REPAIR_OPT_MOVE: Final = "repair_option_move"
 REPAIR_OPT_DELETE: Final = "repair_option_delete"
@@ -161,3 +183,83 @@ CURRENT_WEATHER_SENSOR_ICON: Final = {'temperature': None,
                                        'wind_bearing': 'mdi:compass',
                                        'uv_index': 'mdi:sun-wireless',
                                        'pressure': None}
+
+# Coordinators whose zones round to the same coordinates at this precision share their forecast requests
+FORECAST_CELL_DECIMALS: Final = 2
+# A forecast fetched for a cell less than this long ago is reused by the other coordinators of that cell
+FORECAST_HUB_MAX_AGE: Final = timedelta(minutes=3)
+DATA_FORECAST_HUB: Final = f"{DOMAIN}_forecast_hub"
+DATA_DATASET_HUB: Final = f"{DOMAIN}_dataset_hub"
+DATA_FRAME_STORE: Final = f"{DOMAIN}_frame_store"
+DATA_LAYER_CACHE: Final = f"{DOMAIN}_layer_cache"
+
+# Connections to the API hosts: kept open between refreshes (radar frames are downloaded in bursts), DNS cached
+HTTP_LIMIT_PER_HOST: Final = 6
+HTTP_KEEPALIVE_TIMEOUT: Final = 120
+HTTP_DNS_CACHE_TTL: Final = 3600
+DATA_HTTP_SESSION: Final = f"{DOMAIN}_http_session"
+
+# Refreshes happen this long after the expected publication of new radar frames (every 10 minutes), spread over
+# PUBLICATION_SPREAD for all the entries.
+PUBLICATION_GUARD: Final = timedelta(seconds=30)
+PUBLICATION_SPREAD: Final = timedelta(minutes=1)
+PUBLICATION_MIN_DELAY: Final = timedelta(minutes=1)
+
+# Requests sent to the API by all the config entries: at most API_RATE_BURST at once, then API_RATE_LIMIT per second
+API_RATE_LIMIT: Final = 5
+API_RATE_BURST: Final = 10
+DATA_RATE_LIMITER: Final = f"{DOMAIN}_rate_limiter"
+# Refreshes of the config entries are spread evenly over the polling interval, with this much jitter (fraction of the
+# time between two entries)
+STAGGER_JITTER: Final = 0.1
+DATA_SCHEDULER: Final = f"{DOMAIN}_scheduler"
+
+# Requests to a host are not sent anymore after this many consecutive errors, then the host is probed again after a
+# backoff doubling at each failed probe, with jitter
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_MIN_BACKOFF: Final = timedelta(minutes=1)
+BREAKER_MAX_BACKOFF: Final = timedelta(minutes=30)
+BREAKER_BACKOFF_JITTER: Final = 0.2
+DATA_CIRCUIT_BREAKER: Final = f"{DOMAIN}_circuit_breaker"
+
+# Forecast requests slower than HEDGE_LATENCY_QUANTILE of the last HEDGE_LATENCY_SAMPLES are sent a second time, for
+# at most HEDGE_MAX_RATIO of the requests
+CONF_HEDGE_REQUESTS: Final = 'hedge_requests'
+HEDGE_LATENCY_QUANTILE: Final = 0.9
+HEDGE_LATENCY_SAMPLES: Final = 50
+HEDGE_MIN_SAMPLES: Final = 10
+HEDGE_MAX_RATIO: Final = 0.05
+HEDGE_BUDGET_BURST: Final = 2
+DATA_HEDGER: Final = f"{DOMAIN}_hedger"
+
+# Identical API calls made at the same time are sent once.  Their result is also given to the calls made this many
+# seconds after it was received (e.g. a config entry loaded right after its config flow validated the location).
+SINGLE_FLIGHT_TTL: Final = 15
+DATA_SINGLE_FLIGHT: Final = f"{DOMAIN}_single_flight"
+# Forecast downloaded by the config or repair flow to validate a location, used by the first refresh of the entry
+VALIDATED_FORECAST_MAX_AGE: Final = timedelta(minutes=2)
+
+# Static layers of the rain graph (location layer) kept on disk
+LAYER_CACHE_STORAGE_VERSION: Final = 1
+LAYER_CACHE_MAX_BYTES: Final = 5 * 1024 * 1024
+# Seconds to wait before writing the index to disk after a layer was read (new layers are saved right away)
+LAYER_CACHE_SAVE_DELAY: Final = 60
+
+# Maximum number of rain graphs built at the same time in worker threads, for all the config entries.  The largest
+# value configured in the config entries is used.
+CONF_RENDER_WORKERS: Final = 'render_workers'
+RAIN_GRAPH_MAX_WORKERS: Final = 2
+DATA_RENDER_POOL: Final = f"{DOMAIN}_render_pool"
+
+SNAPSHOT_STORAGE_VERSION: Final = 1
+# Seconds to wait before writing the snapshot of the data to disk
+SNAPSHOT_SAVE_DELAY: Final = 30
+
+DEFAULT_UPDATE_INTERVAL: Final = timedelta(minutes=7)
+# Poll at the minimum interval when rain is forecasted within this delay by the radar
+RAIN_LOOKAHEAD: Final = timedelta(hours=1)
+# Poll at the minimum interval when a warning starts within this delay
+WARNING_LOOKAHEAD: Final = timedelta(hours=3)
+
+# Number of refreshes kept in the diagnostics
+DIAGNOSTICS_HISTORY_SIZE: Final = 20
@@ -1,26 +1,55 @@
 """DataUpdateCoordinator for the IRM KMI integration."""
+import asyncio
+import copy
 import logging
-from datetime import timedelta
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Set, Tuple
 
 import async_timeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE, CONF_ZONE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import issue_registry
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import (
     TimestampDataUpdateCoordinator, UpdateFailed)
 from homeassistant.util import dt
 from homeassistant.util.dt import utcnow
-from irm_kmi_api.api import IrmKmiApiClientHa, IrmKmiApiError
+from irm_kmi_api.api import IrmKmiApiError
+from irm_kmi_api.data import IrmKmiForecast, RadarAnimationData
 from irm_kmi_api.pollen import PollenParser
 from irm_kmi_api.rain_graph import RainGraph
 
-from .const import CONF_DARK_MODE, CONF_STYLE, DOMAIN, IRM_KMI_NAME
+from .api import IrmKmiConditionalApiClient
+from .breaker import IrmKmiCircuitOpenError, get_circuit_breaker
+from .const import (CONF_DARK_MODE, CONF_FORECAST_DEADLINE,
+                    CONF_HEDGE_REQUESTS, CONF_MAX_UPDATE_INTERVAL,
+                    CONF_MIN_UPDATE_INTERVAL, CONF_POLLEN_DEADLINE,
+                    CONF_RADAR_DEADLINE, CONF_RENDER_DEADLINE,
+                    CONF_STALE_DATA_MAX_AGE, CONF_STYLE,
+                    DEFAULT_FORECAST_DEADLINE, DEFAULT_MAX_UPDATE_INTERVAL,
+                    DEFAULT_MIN_UPDATE_INTERVAL, DEFAULT_POLLEN_DEADLINE,
+                    DEFAULT_RADAR_DEADLINE, DEFAULT_RENDER_DEADLINE,
+                    DEFAULT_STALE_DATA_MAX_AGE, DEFAULT_UPDATE_INTERVAL,
+                    DIAGNOSTICS_HISTORY_SIZE, DOMAIN, IRM_KMI_NAME)
 from .const import IRM_KMI_TO_HA_CONDITION_MAP as CDT_MAP
-from .const import OUT_OF_BENELUX, USER_AGENT
+from .const import (OUT_OF_BENELUX, PUBLICATION_SPREAD, RAIN_LOOKAHEAD,
+                    USER_AGENT, WARNING_LOOKAHEAD)
 from .data import ProcessedCoordinatorData
+from .frames import IrmKmiFrameCache, get_frame_store
+from .geofence import is_out_of_benelux
+from .hedging import get_hedger
+from .hub import get_dataset_hub, get_forecast_hub
+from .layers import IrmKmiLayerClient, get_layer_cache
+from .publication import IrmKmiPublicationTracker
+from .render import configured_render_workers, get_render_pool
+from .scheduler import get_rate_limiter, get_scheduler
+from .session import get_http_session
+from .singleflight import get_single_flight
+from .store import IrmKmiSnapshotStore
 from .utils import disable_from_config, get_config_value, preferred_language
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,12 +67,68 @@ class IrmKmiCoordinator(TimestampDataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name="IRM KMI weather",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(minutes=7),
+            # Adapted after each update, depending on the rain and warnings forecasted.
+            update_interval=DEFAULT_UPDATE_INTERVAL,
         )
-        self._api = IrmKmiApiClientHa(session=async_get_clientsession(hass), user_agent=USER_AGENT, cdt_map=CDT_MAP)
+        # Forecast requests slower than usual are sent twice when enabled in the options
+        self._hedger = get_hedger(hass) if get_config_value(entry, CONF_HEDGE_REQUESTS, False) else None
+        self._api = IrmKmiConditionalApiClient(session=get_http_session(hass).session,
+                                               user_agent=USER_AGENT,
+                                               cdt_map=CDT_MAP,
+                                               single_flight=get_single_flight(hass),
+                                               rate_limiter=get_rate_limiter(hass),
+                                               circuit_breaker=get_circuit_breaker(hass),
+                                               hedger=self._hedger)
+        self._scheduler = get_scheduler(hass)
+        self._scheduler.register(entry.entry_id)
+        # When radar frames are published, learnt from the forecasts received
+        self._publication = IrmKmiPublicationTracker()
+        self._forecast_hub = get_forecast_hub(hass)
+        self._dataset_hub = get_dataset_hub(hass)
+        self._layer_cache = get_layer_cache(hass)
+        self._render_pool = get_render_pool(hass)
+        # The options of the entries may have changed since the pool was created
+        self._render_pool.set_max_workers(configured_render_workers(hass))
         self._zone = get_config_value(entry, CONF_ZONE)
         self._dark_mode = get_config_value(entry, CONF_DARK_MODE)
         self._style = get_config_value(entry, CONF_STYLE)
+        self._min_update_interval = timedelta(minutes=get_config_value(entry, CONF_MIN_UPDATE_INTERVAL,
+                                                                        DEFAULT_MIN_UPDATE_INTERVAL))
+        self._max_update_interval = timedelta(minutes=get_config_value(entry, CONF_MAX_UPDATE_INTERVAL,
+                                                                        DEFAULT_MAX_UPDATE_INTERVAL))
+        self._store = IrmKmiSnapshotStore(hass, entry.entry_id)
+        # Radar animation data used to build the current rain graph, before the graph downloads the images
+        self._radar_animation: RadarAnimationData | None = None
+        # Radar images downloaded by the current rain graph, reused by the next one
+        self._frame_cache = IrmKmiFrameCache(get_frame_store(hass),
+                                             lambda: IrmKmiLayerClient(self._layer_cache, self._api))
+        # Last result of each forecast parser, with the key it was computed for
+        self._parsed_sections: Dict[str, Tuple[tuple, Any]] = dict()
+        # Duration in seconds of each stage of the last refresh, and of the previous refreshes for diagnostics
+        self.stage_durations: Dict[str, float] = dict()
+        self.refresh_history: Deque[dict] = deque(maxlen=DIAGNOSTICS_HISTORY_SIZE)
+        # Last error of each stage, for diagnostics
+        self.stage_errors: Dict[str, dict] = dict()
+        self._parse_stats: Dict[str, int] = {'hits': 0, 'misses': 0}
+        # Keys of the data that are new objects since the previous refresh
+        self.changed_datasets: Set[str] = set()
+        # When the data was fetched from the API, and whether the data is older than the last refresh (API errors)
+        self.data_updated_at: datetime | None = None
+        self.serving_stale: bool = False
+        self._stale_data_max_age = timedelta(minutes=get_config_value(entry, CONF_STALE_DATA_MAX_AGE,
+                                                                      DEFAULT_STALE_DATA_MAX_AGE))
+        # Seconds each stage of a refresh may take before its previous data is kept instead
+        self._deadlines: Dict[str, float] = {
+            stage: get_config_value(entry, key, default) for stage, key, default in (
+                ('forecast', CONF_FORECAST_DEADLINE, DEFAULT_FORECAST_DEADLINE),
+                ('pollen', CONF_POLLEN_DEADLINE, DEFAULT_POLLEN_DEADLINE),
+                ('radar', CONF_RADAR_DEADLINE, DEFAULT_RADAR_DEADLINE),
+                ('render', CONF_RENDER_DEADLINE, DEFAULT_RENDER_DEADLINE))
+        }
+        # Sections of the data kept from a previous refresh because their stage failed or missed its deadline
+        self._stale_sections: Set[str] = set()
+        # Pollen is published once a day: date of the pollen data we have
+        self._pollen_date: date | None = None
         self.shared_device_info = DeviceInfo(
             entry_type=DeviceEntryType.SERVICE,
             identifiers={(DOMAIN, entry.entry_id)},
@@ -61,27 +146,49 @@ class IrmKmiCoordinator(TimestampDataUpdateCoordinator):
         logging.getLogger('irm_kmi_api').setLevel(_LOGGER.getEffectiveLevel())
 
         self._api.expire_cache()
+        self.stage_durations = dict()
+        self.changed_datasets = set()
         if (zone := self.hass.states.get(self._zone)) is None:
             raise UpdateFailed(f"Zone '{self._zone}' not found")
+
+        # Zones far from Benelux are known to be out of Benelux without asking the API
+        out_of_benelux = is_out_of_benelux(zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE])
         try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with async_timeout.timeout(60):
-                await self._api.refresh_forecasts_coord(
-                    {'lat': zone.attributes[ATTR_LATITUDE],
-                     'long': zone.attributes[ATTR_LONGITUDE]}
-                )
-
-        except IrmKmiApiError as err:
-            if self.last_update_success_time is not None \
-                    and self.last_update_success_time - utcnow() < 2.5 * self.update_interval:
-                _LOGGER.warning(f"Error communicating with API for general forecast: {err}. Keeping the old data.")
+            # Note: aiohttp.ClientError is already handled by the data update coordinator.
+            async with async_timeout.timeout(self._deadlines['forecast']), self._measure('forecast'):
+                if not out_of_benelux:
+                    # Coordinators with zones close to each other share the same request
+                    await self._forecast_hub.async_refresh(
+                        self.config_entry.entry_id,
+                        zone.attributes[ATTR_LATITUDE],
+                        zone.attributes[ATTR_LONGITUDE],
+                        self._api
+                    )
+
+        except (IrmKmiApiError, asyncio.TimeoutError) as err:
+            if isinstance(err, asyncio.TimeoutError):
+                err = IrmKmiApiError(f"no forecast after {self._deadlines['forecast']} seconds")
+            # The deadline cancels the request inside the measured block: the error is recorded here
+            self._record_error('forecast', err)
+            if isinstance(err, IrmKmiCircuitOpenError):
+                # Do not wake up before the API can be probed again
+                self.update_interval = max(timedelta(seconds=err.retry_in), self._min_update_interval)
+
+            data_age = self.data_age()
+            if self.data is not None and data_age is not None and data_age <= self._stale_data_max_age:
+                _LOGGER.warning(f"Error communicating with API for general forecast: {err}. Keeping the old data "
+                                f"from {self.data_updated_at}.")
+                self.serving_stale = True
+                # Every section is the one of the last successful refresh
+                self.data['stale_sections'] = sorted(k for k in self.data.keys() if k != 'stale_sections')
+                # Entities show the age of the data they are given
+                self.changed_datasets = set(self.data.keys())
                 return self.data
             else:
                 raise UpdateFailed(f"Error communicating with API for general forecast: {err}. "
-                                   f"Last success time is: {self.last_update_success_time}")
+                                   f"Last fresh data is from: {self.data_updated_at}")
 
-        if self._api.get_city() in OUT_OF_BENELUX:
+        if out_of_benelux or self._api.get_city() in OUT_OF_BENELUX:
             _LOGGER.error(f"The zone {self._zone} is now out of Benelux and forecast is only available in Benelux. "
                           f"Associated device is now disabled.  Move the zone back in Benelux and re-enable to fix "
                           f"this")
@@ -99,51 +206,299 @@ class IrmKmiCoordinator(TimestampDataUpdateCoordinator):
             )
             return ProcessedCoordinatorData()
 
-        return await self.process_api_data()
+        data = await self.process_api_data()
+        # Datasets are reused as is when they did not change: entities only look at the ones they read
+        self.changed_datasets = {k for k in data if self.serving_stale or self.data is None
+                                 or data.get(k) is not self.data.get(k)}
+        self.data_updated_at = utcnow()
+        self.serving_stale = False
+        self.refresh_history.append({'time': utcnow().isoformat(),
+                                     'stages': dict(self.stage_durations),
+                                     'changed': sorted(self.changed_datasets),
+                                     'stale': data.get('stale_sections', [])})
+        self._store.async_delay_save(self._snapshot_fingerprint(), data, self._radar_animation)
+
+        # A rain graph kept from a previous refresh has the frame times of an older forecast
+        if self._radar_animation is not None and 'animation' not in data.get('stale_sections', []):
+            # The forecast may have been received by another entry of the same cell a bit earlier
+            age = self._forecast_hub.age(zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE])
+            self._publication.observe([f['time'] for f in self._radar_animation.get('sequence', [])],
+                                      utcnow() - timedelta(seconds=age if age != float('inf') else 0))
+        self.update_interval = self._next_update_interval(data)
+        return data
 
     async def async_refresh(self) -> None:
         """Refresh data and log errors."""
         await self._async_refresh(log_failures=True, raise_on_entry_error=True)
 
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and release the radar images shared with the other entries."""
+        await super().async_shutdown()
+        self._frame_cache.clear()
+        self._scheduler.unregister(self.config_entry.entry_id)
+        self._forecast_hub.forget(self.config_entry.entry_id)
+
+    async def async_restore_data(self) -> bool:
+        """
+        Seed the coordinator with the data saved before the last restart, if it is recent enough.
+
+        :return: True if the coordinator now has data
+        """
+        snapshot = await self._store.async_load(self._snapshot_fingerprint(), self._stale_data_max_age)
+        if snapshot is None:
+            return False
+
+        data, radar_animation, saved_at = snapshot
+        tz = await dt.async_get_time_zone('Europe/Brussels')
+        try:
+            data['animation'] = await self._build_rain_graph(radar_animation, data.get('country'), tz) \
+                if radar_animation is not None else None
+        except asyncio.TimeoutError:
+            # The next refresh builds it
+            data['animation'], radar_animation = None, None
+
+        _LOGGER.debug(f"Restored data saved at {saved_at} for {self.config_entry.title}")
+        self._radar_animation = radar_animation
+        self.data = data
+        self.last_update_success_time = saved_at
+        self.data_updated_at = saved_at
+        self.serving_stale = True
+        return True
+
+    def data_age(self) -> timedelta | None:
+        """Time since the data was fetched from the API, None if there is no data"""
+        return utcnow() - self.data_updated_at if self.data_updated_at is not None else None
+
+    def adaptive_update_interval(self, data: ProcessedCoordinatorData) -> timedelta:
+        """
+        Compute the polling interval to use after receiving the given data: poll more often when rain is coming or
+        when a warning is active or imminent, and less often when the radar is flat and there is no warning.
+
+        :param data: data from the last update
+        :return: interval until the next update
+        """
+        now = dt.now()
+        radar_forecast = data.get('radar_forecast') or []
+        warnings = data.get('warnings') or []
+
+        rain_soon = any(
+            (f.get('native_precipitation') or 0) > 0 or f.get('might_rain')
+            for f in radar_forecast
+            if f.get('datetime') is not None
+            and now - timedelta(minutes=10) <= datetime.fromisoformat(f.get('datetime')) <= now + RAIN_LOOKAHEAD
+        )
+        warning_soon = any(w.get('starts_at') < now + WARNING_LOOKAHEAD and now < w.get('ends_at') for w in warnings)
+
+        if rain_soon or warning_soon:
+            interval = self._min_update_interval
+        elif len(warnings) == 0 and not any((f.get('native_precipitation') or 0) > 0 or f.get('might_rain')
+                                            for f in radar_forecast):
+            interval = self._max_update_interval
+        else:
+            interval = DEFAULT_UPDATE_INTERVAL
+
+        # Only use valid intervals, even if the configured minimum and maximum are inconsistent
+        interval = max(min(interval, self._max_update_interval), self._min_update_interval)
+        _LOGGER.debug(f"Next update for {self.config_entry.title} in {interval}")
+        return interval
+
+    def _next_update_interval(self, data: ProcessedCoordinatorData) -> timedelta:
+        """Interval until the next refresh: adaptive interval, moved right after the next radar publication"""
+        interval = self.adaptive_update_interval(data)
+        if interval <= self._min_update_interval:
+            # Rain or a warning is coming: poll as often as configured, without waiting for radar frames
+            return interval
+
+        aligned = self._publication.next_refresh(utcnow(), interval, self._min_update_interval,
+                                                 self._max_update_interval)
+        if aligned is None:
+            # Entries polling at the same interval refresh one after the other instead of all at once
+            return self._scheduler.stagger(self.config_entry.entry_id, interval, self._min_update_interval,
+                                          self._max_update_interval)
+
+        # Entries refreshing after the same publication are spread over a short window
+        return aligned + self._scheduler.offset(self.config_entry.entry_id, PUBLICATION_SPREAD)
+
+    def _snapshot_fingerprint(self) -> dict:
+        """Configuration values that must not change between saving and restoring the data"""
+        return {'zone': self._zone,
+                'lang': preferred_language(self.hass, self.config_entry),
+                'style': self._style,
+                'dark_mode': self._dark_mode}
+
+    async def _build_rain_graph(self, radar_animation: RadarAnimationData, country: str, tz) -> RainGraph:
+        """Build the rain graph in a worker thread.  Images are only downloaded when the camera needs them."""
+        # The rain graph replaces the URLs by the images once downloaded: keep the original data untouched
+        # Images of the previous graph still in the animation are reused, only the new ones will be downloaded
+        radar_animation = self._frame_cache.apply(copy.deepcopy(radar_animation))
+        async with async_timeout.timeout(self._deadlines['render']):
+            with self._measure('render'):
+                return await self._render_pool.async_build(lambda: RainGraph(radar_animation,
+                                                                             country=country,
+                                                                             style=self._style,
+                                                                             tz=tz,
+                                                                             dark_mode=self._dark_mode,
+                                                                             api_client=self._frame_cache))
+
     async def process_api_data(self) -> ProcessedCoordinatorData:
         """From the API data, create the object that will be used in the entities"""
         tz = await dt.async_get_time_zone('Europe/Brussels')
         lang = preferred_language(self.hass, self.config_entry)
-        try:
-            pollen = await self._api.get_pollen()
-        except IrmKmiApiError as err:
-            _LOGGER.warning(f"Could not get pollen data from the API: {err}. Keeping the same data.")
-            pollen = self.data.get('pollen', PollenParser.get_unavailable_data()) \
-                if self.data is not None else PollenParser.get_unavailable_data()
+        self._stale_sections = set()
 
-        try:
-            radar_animation = self._api.get_animation_data(tz, lang, self._style, self._dark_mode)
-            animation = await RainGraph(radar_animation,
-                                        country=self._api.get_country(),
-                                        style=self._style,
-                                        tz=tz,
-                                        dark_mode=self._dark_mode,
-                                        api_client=self._api
-                                        ).build()
-        except ValueError:
-            animation = None
+        # Pollen and radar only depend on the forecast: run them together.  The pollen request is started first so
+        # that the rain graph is built while waiting for the pollen response.
+        with self._measure('pollen_and_radar'):
+            pollen, animation = await asyncio.gather(
+                self._get_pollen(),
+                self._get_animation(tz, lang)
+            )
+
+        with self._measure('parse'):
+            # Sections of the forecast that did not change since the last refresh are not parsed again.  The parsers
+            # also depend on the current time: the hour or the day is part of the key when needed.
+            digests = self._api.get_section_digests()
+            now = dt.now(tz)
+            hour = now.strftime('%Y-%m-%d %H')
+
+            data = ProcessedCoordinatorData(
+                current_weather=self._parse_section(
+                    'current_weather',
+                    (digests.get('obs'), digests.get('country'), digests.get('module'), digests.get('for.hourly'), hour),
+                    lambda: self._api.get_current_weather(tz)),
+                daily_forecast=self._parse_section(
+                    'daily_forecast',
+                    (digests.get('for.daily'), lang, hour),
+                    lambda: self._get_daily_forecast(tz, lang)),
+                hourly_forecast=self._parse_section(
+                    'hourly_forecast',
+                    (digests.get('for.hourly'), now.date()),
+                    lambda: self._api.get_hourly_forecast(tz)),
+                radar_forecast=self._parse_section(
+                    'radar_forecast',
+                    (digests.get('animation'),),
+                    lambda: self._api.get_radar_forecast()),
+                animation=animation,
+                warnings=self._parse_section(
+                    'warnings',
+                    (digests.get('for.warning'), lang),
+                    lambda: self._dataset_hub.get_warnings(self._api, lang)),
+                pollen=pollen,
+                country=self._api.get_country(),
+                stale_sections=sorted(self._stale_sections)
+            )
 
+        _LOGGER.debug(f"Refresh stages for {self.config_entry.title}: "
+                      + ", ".join([f"{stage} {duration:.3f}s" for stage, duration in self.stage_durations.items()]))
+        return data
 
+    def _get_daily_forecast(self, tz, lang: str) -> List[IrmKmiForecast]:
+        """Parse the daily forecast"""
         # Make 'condition_evol' in a str instead of enum variant
-        daily_forecast = [
+        return [
             {**d, "condition_evol": d["condition_evol"].value}
             if "condition_evol" in d and hasattr(d["condition_evol"], "value")
             else d
             for d in self._api.get_daily_forecast(tz, lang)
         ]
 
-        return ProcessedCoordinatorData(
-            current_weather=self._api.get_current_weather(tz),
-            daily_forecast=daily_forecast,
-            hourly_forecast=self._api.get_hourly_forecast(tz),
-            radar_forecast=self._api.get_radar_forecast(),
-            animation=animation,
-            warnings=self._api.get_warnings(lang),
-            pollen=pollen,
-            country=self._api.get_country()
-        )
+    def _parse_section(self, name: str, key: tuple, parser: Callable[[], Any]) -> Any:
+        """
+        Parse a section of the forecast, or reuse the result of the last parsing if the key did not change.
+
+        :param name: name of the section
+        :param key: hashes and parameters the result of the parser depends on
+        :param parser: function parsing the section
+        :return: parsed section, the same object as the last time if the key did not change
+        """
+        cached = self._parsed_sections.get(name)
+        if cached is not None and cached[0] == key:
+            self._parse_stats['hits'] += 1
+            return cached[1]
+
+        self._parse_stats['misses'] += 1
+        value = parser()
+        self._parsed_sections[name] = (key, value)
+        return value
+
+    async def _get_pollen(self) -> dict:
+        """Get the pollen data from the API once a day, keep the previous data if it fails"""
+        with self._measure('pollen'):
+            today = dt.now().date()
+            if self._pollen_date == today and self.data is not None and self.data.get('pollen') is not None:
+                return self.data.get('pollen')
+
+            try:
+                async with async_timeout.timeout(self._deadlines['pollen']):
+                    pollen = await self._dataset_hub.async_get_pollen(self._api)
+                self._pollen_date = today
+                return pollen
+            except IrmKmiApiError as err:
+                _LOGGER.warning(f"Could not get pollen data from the API: {err}. Keeping the same data.")
+                self._record_error('pollen', err)
+            except asyncio.TimeoutError as err:
+                _LOGGER.warning(f"No pollen data after {self._deadlines['pollen']} seconds. Keeping the same data.")
+                self._record_error('pollen', err)
+
+            if self.data is None or self.data.get('pollen') is None:
+                return PollenParser.get_unavailable_data()
+            self._stale_sections.add('pollen')
+            return self.data.get('pollen')
+
+    async def _get_animation(self, tz, lang: str) -> RainGraph | None:
+        """Build the rain graph for the radar data of the forecast, when the radar data changed"""
+        with self._measure('radar'):
+            try:
+                radar_animation = self._api.get_animation_data(tz, lang, self._style, self._dark_mode)
+                # Radar frames are published every 10 minutes: most refreshes get the same animation
+                if (radar_animation == self._radar_animation
+                        and self.data is not None and self.data.get('animation') is not None):
+                    return self.data.get('animation')
+                async with async_timeout.timeout(self._deadlines['radar']):
+                    animation = await self._build_rain_graph(radar_animation, self._api.get_country(), tz)
+                self._radar_animation = radar_animation
+            except ValueError:
+                animation = None
+                self._radar_animation = None
+            except asyncio.TimeoutError as err:
+                # The render deadline may be the one missed: it is in stage_errors as well then
+                _LOGGER.warning("Rain graph not ready in time. Keeping the same one.")
+                self._record_error('radar', err)
+                if self.data is None or self.data.get('animation') is None:
+                    return None
+                self._stale_sections.add('animation')
+                return self.data.get('animation')
+            return animation
+
+    @contextmanager
+    def _measure(self, stage: str):
+        """Record how long the given stage of the refresh takes in self.stage_durations"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as err:
+            self._record_error(stage, err)
+            raise
+        finally:
+            self.stage_durations[stage] = time.perf_counter() - start
+
+    def _record_error(self, stage: str, err: BaseException) -> None:
+        """Keep the last error of the given stage for diagnostics"""
+        self.stage_errors[stage] = {'time': utcnow().isoformat(), 'error': f"{type(err).__name__}: {err}"}
+
+    def get_refresh_statistics(self) -> dict:
+        """Durations, errors, downloads and caches statistics of the refreshes, for diagnostics"""
+        return {
+            'refresh_history': list(self.refresh_history),
+            'stage_errors': dict(self.stage_errors),
+            'http': copy.deepcopy(getattr(self._api, 'http_stats', {})),
+            'connections': dict(get_http_session(self.hass).stats),
+            # The hedging is shared by the entries that enabled it: its counters are the ones of all these entries
+            'hedging': {'scope': 'global'} | self._hedger.stats if self._hedger is not None else None,
+            'animation': {'frames': len(self._radar_animation.get('sequence', []))
+                          if self._radar_animation is not None else 0,
+                          'images_cached': len(self._frame_cache),
+                          'images_bytes': self._frame_cache.size_bytes()},
+            'caches': {'radar_frames': {'hits': self._frame_cache.hits, 'misses': self._frame_cache.misses},
+                       'parsed_sections': dict(self._parse_stats)}
+        }
@@ -15,3 +15,5 @@ class ProcessedCoordinatorData(TypedDict, total=False):
     warnings: List[WarningData]
     pollen: dict
     country: str
+    # Sections kept from a previous refresh because their stage failed or missed its deadline
+    stale_sections: List[str]
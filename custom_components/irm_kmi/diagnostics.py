@@ -0,0 +1,29 @@
+"""Diagnostics support for IRM KMI"""
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import IrmKmiCoordinator
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry: configuration, state of the coordinator and refresh statistics"""
+    coordinator: IrmKmiCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        'config_entry': {
+            'data': dict(entry.data),
+            'options': dict(entry.options)
+        },
+        'coordinator': {
+            'last_update_success': coordinator.last_update_success,
+            'last_update_success_time': coordinator.last_update_success_time.isoformat()
+            if coordinator.last_update_success_time is not None else None,
+            'update_interval': coordinator.update_interval.total_seconds()
+            if coordinator.update_interval is not None else None,
+            'last_stage_durations': dict(coordinator.stage_durations)
+        },
+        'refresh': coordinator.get_refresh_statistics()
+    }
@@ -0,0 +1,61 @@
+"""Base entity for the IRM KMI integration"""
+import logging
+from typing import Any, Tuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when the state or the attributes changed since the last update.
+
+    Most of the values do not change from one refresh to the next (pollen, sunrise, warnings...): skipping the write
+    avoids state changed events and recorder rows for nothing.
+    """
+
+    _last_written_state: Tuple[Any, ...] | None = None
+    # Keys of the coordinator data the state is computed from.  None if the state also depends on the current time.
+    _datasets: Tuple[str, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, write the state only if it changed."""
+        if (self._datasets is not None
+                and self._last_written_state is not None
+                and self._last_written_state[0] == self.available
+                and not self.coordinator.changed_datasets.intersection(self._datasets)):
+            return
+
+        state = self._state_snapshot()
+        if state == self._last_written_state:
+            _LOGGER.debug(f"State of {self.entity_id} did not change, not writing it")
+            return
+
+        self._last_written_state = state
+        super()._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the extra attributes and the age of the data when it could not be refreshed."""
+        return (self._extra_attributes() | self._data_age_attributes()) or None
+
+    def _extra_attributes(self) -> dict:
+        """Extra state attributes of the entity, without the age of the data"""
+        return {}
+
+    def _data_age_attributes(self) -> dict:
+        """Age of the data in seconds, only while the coordinator serves data older than its last refresh"""
+        if not self.coordinator.serving_stale or (data_age := self.coordinator.data_age()) is None:
+            return {}
+        return {'data_age': int(data_age.total_seconds())}
+
+    def _state_snapshot(self) -> Tuple[Any, ...]:
+        """Availability, state and attributes written in the state machine.
+
+        They are not copied: the attributes must not modify the data of the coordinator, so that the snapshot of the
+        last state written is not changed afterwards.
+        """
+        attributes = (self.state_attributes or {}) | (self.extra_state_attributes or {})
+        return self.available, self.state, attributes
@@ -0,0 +1,147 @@
+"""Keep the radar images between refreshes and share them between the config entries"""
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, Set
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from irm_kmi_api.api import IrmKmiApiClient
+from irm_kmi_api.data import RadarAnimationData
+
+from .const import DATA_FRAME_STORE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiFrameStore:
+    """Process-wide store of the radar images, by URL, with the number of rain graphs using each of them.
+
+    Radar frames are the same for all the zones of a country: they are downloaded once for all the config entries.
+    An image is dropped as soon as no rain graph uses it anymore.
+    """
+
+    def __init__(self) -> None:
+        self._images: Dict[str, bytes] = dict()
+        self._references: Dict[str, int] = dict()
+        self._downloads: Dict[str, asyncio.Task] = dict()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def get(self, url: str) -> bytes | None:
+        """Get the image if it was already downloaded"""
+        return self._images.get(url)
+
+    def acquire(self, urls: Iterable[str]) -> None:
+        """Declare that a rain graph uses the images at the given URLs"""
+        for url in urls:
+            self._references[url] = self._references.get(url, 0) + 1
+
+    def release(self, urls: Iterable[str]) -> None:
+        """Declare that a rain graph does not use the images at the given URLs anymore"""
+        for url in urls:
+            count = self._references.get(url, 0) - 1
+            if count > 0:
+                self._references[url] = count
+            else:
+                self._references.pop(url, None)
+                self._images.pop(url, None)
+
+    async def async_get_image(self, url: str, api_client: IrmKmiApiClient) -> bytes:
+        """
+        Get the image, downloading it if needed.  Concurrent requests for the same image share the same download.
+
+        :param url: URL of the image
+        :param api_client: API client used to download the image
+        :return: image as bytes
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        if (image := self._images.get(url)) is not None:
+            return image
+
+        if url not in self._downloads:
+            task = self._downloads[url] = asyncio.get_running_loop().create_task(api_client.get_image(url))
+            task.add_done_callback(lambda t: self._download_done(url, t))
+
+        return await asyncio.shield(self._downloads[url])
+
+    def _download_done(self, url: str, task: asyncio.Task) -> None:
+        self._downloads.pop(url, None)
+        if not task.cancelled() and task.exception() is None and url in self._references:
+            self._images[url] = task.result()
+
+
+class IrmKmiFrameCache:
+    """Radar frames and location layer used by the current rain graph of a coordinator.
+
+    Radar frames are published every 10 minutes and the animation window slides forward: between two refreshes,
+    most of the frames are the same.  The cache is given to the rain graph as its API client so that the images it
+    downloads end up in the shared store, and the images already known are put in the animation data before building
+    the next graph.
+    """
+
+    def __init__(self, store: IrmKmiFrameStore, api_client: Callable[[], IrmKmiApiClient]) -> None:
+        """
+        :param store: process-wide store of the images
+        :param api_client: function returning the API client to use to download the images that are not stored
+        """
+        self._store = store
+        self._api_client = api_client
+        self._urls: Set[str] = set()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len([url for url in self._urls if self._store.get(url) is not None])
+
+    def size_bytes(self) -> int:
+        """Total size of the images used by the current rain graph, already downloaded"""
+        return sum(len(image) for url in self._urls if (image := self._store.get(url)) is not None)
+
+    async def get_image(self, url: str, params: Dict[str, str] | None = None) -> bytes:
+        """Get the image from the store or download it with the API client"""
+        if params is not None:
+            return await self._api_client().get_image(url, params)
+
+        if self._store.get(url) is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return await self._store.async_get_image(url, self._api_client())
+
+    def apply(self, radar_animation: RadarAnimationData) -> RadarAnimationData:
+        """
+        Use the images of the given animation instead of the ones of the previous one, and replace the URLs of the
+        animation by the images already downloaded.  The animation data is modified in place.
+
+        :param radar_animation: animation data with the URLs of the images
+        :return: the same animation data, with the stored images instead of their URLs
+        """
+        urls = {f['image'] for f in radar_animation.get('sequence', []) if isinstance(f.get('image'), str)}
+        if isinstance(radar_animation.get('location'), str):
+            urls.add(radar_animation['location'])
+
+        self._store.acquire(urls - self._urls)
+        self._store.release(self._urls - urls)
+        self._urls = urls
+
+        for frame in radar_animation.get('sequence', []):
+            if isinstance(frame.get('image'), str) and (image := self._store.get(frame['image'])) is not None:
+                frame['image'] = image
+        if isinstance(radar_animation.get('location'), str) \
+                and (image := self._store.get(radar_animation['location'])) is not None:
+            radar_animation['location'] = image
+
+        _LOGGER.debug(f"Reusing {len(self)} radar images, {len(urls) - len(self)} to download")
+        return radar_animation
+
+    def clear(self) -> None:
+        """Stop using the images, when the coordinator is unloaded"""
+        self._store.release(self._urls)
+        self._urls = set()
+
+
+@singleton(DATA_FRAME_STORE)
+def get_frame_store(hass: HomeAssistant) -> IrmKmiFrameStore:
+    """Get the radar images store shared by all the config entries"""
+    return IrmKmiFrameStore()
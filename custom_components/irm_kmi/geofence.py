@@ -0,0 +1,78 @@
+"""Tell if a location is in Benelux without asking the API"""
+import math
+from typing import Final, List, Tuple
+
+# Simplified outline of Belgium, the Netherlands and Luxembourg as (latitude, longitude), clockwise from the Dollart.
+# It is only accurate to a few kilometers: locations close to it are left to the API to decide.
+BENELUX_BOUNDARY: Final[List[Tuple[float, float]]] = [
+    (53.28, 7.20), (53.10, 7.20), (52.85, 7.08), (52.64, 6.78), (52.53, 6.75), (52.45, 7.00), (52.40, 7.05),
+    (52.22, 7.00), (52.10, 6.73), (51.95, 6.80), (51.86, 6.50), (51.84, 6.40), (51.87, 6.17), (51.78, 5.95),
+    (51.47, 6.20), (51.36, 6.22), (51.20, 6.08), (51.03, 5.88), (50.98, 5.95), (50.85, 6.10), (50.754, 6.021),
+    (50.65, 6.16), (50.50, 6.18), (50.45, 6.35), (50.25, 6.40), (50.14, 6.14), (50.05, 6.13), (49.93, 6.21),
+    (49.87, 6.29), (49.81, 6.42), (49.71, 6.50), (49.68, 6.44), (49.54, 6.37), (49.47, 6.37), (49.50, 6.28),
+    (49.46, 6.09), (49.47, 5.98), (49.546, 5.818), (49.50, 5.55), (49.62, 5.35), (49.72, 5.10), (49.90, 4.85),
+    (50.17, 4.85), (50.14, 4.70), (49.97, 4.50), (49.98, 4.20), (50.17, 4.18), (50.29, 4.05), (50.35, 3.75),
+    (50.47, 3.60), (50.49, 3.50), (50.55, 3.30), (50.62, 3.28), (50.72, 3.22), (50.80, 3.12), (50.77, 3.00),
+    (50.73, 2.90), (50.81, 2.86), (50.94, 2.63), (51.09, 2.54), (51.23, 2.90), (51.37, 3.36), (51.55, 3.42),
+    (51.82, 3.85), (51.98, 4.10), (52.10, 4.25), (52.46, 4.55), (52.60, 4.60), (52.96, 4.72), (53.18, 4.85),
+    (53.30, 4.98), (53.42, 5.30), (53.47, 5.70), (53.50, 6.15), (53.55, 6.55), (53.40, 7.00),
+]
+
+# Locations closer than this to the simplified outline may be on either side of the actual border
+BORDER_MARGIN_KM: Final = 25
+
+_KM_PER_DEGREE: Final = 111.2
+
+
+def _bounding_box(polygon: List[Tuple[float, float]], margin_km: float) -> Tuple[float, float, float, float]:
+    lats = [lat for lat, _ in polygon]
+    longs = [long for _, long in polygon]
+    lat_margin = margin_km / _KM_PER_DEGREE
+    long_margin = margin_km / (_KM_PER_DEGREE * math.cos(math.radians(max(lats))))
+    return min(lats) - lat_margin, max(lats) + lat_margin, min(longs) - long_margin, max(longs) + long_margin
+
+
+_BOUNDING_BOX: Final = _bounding_box(BENELUX_BOUNDARY, BORDER_MARGIN_KM)
+
+
+def is_out_of_benelux(lat: float, long: float) -> bool | None:
+    """
+    Tell if the location is out of Benelux, using the bundled outline of Benelux.
+
+    :param lat: latitude of the location
+    :param long: longitude of the location
+    :return: True if the location is out of Benelux, False if it is in Benelux, None if it is too close to the border
+    to be sure (the forecast of the API tells then)
+    """
+    min_lat, max_lat, min_long, max_long = _BOUNDING_BOX
+    if not (min_lat <= lat <= max_lat and min_long <= long <= max_long):
+        return True
+
+    if _distance_to_boundary_km(lat, long) < BORDER_MARGIN_KM:
+        return None
+
+    return not _inside(lat, long)
+
+
+def _inside(lat: float, long: float) -> bool:
+    """Ray casting: the location is inside if a ray going east crosses the outline an odd number of times"""
+    inside = False
+    for (lat_a, long_a), (lat_b, long_b) in zip(BENELUX_BOUNDARY, BENELUX_BOUNDARY[1:] + BENELUX_BOUNDARY[:1]):
+        if (lat_a > lat) != (lat_b > lat):
+            crossing = long_a + (lat - lat_a) * (long_b - long_a) / (lat_b - lat_a)
+            if long < crossing:
+                inside = not inside
+    return inside
+
+
+def _distance_to_boundary_km(lat: float, long: float) -> float:
+    """Approximate distance to the outline, projecting the coordinates on a plane around the location"""
+    scale = math.cos(math.radians(lat))
+    distance = float('inf')
+    for (lat_a, long_a), (lat_b, long_b) in zip(BENELUX_BOUNDARY, BENELUX_BOUNDARY[1:] + BENELUX_BOUNDARY[:1]):
+        ax, ay = (long_a - long) * scale, lat_a - lat
+        bx, by = (long_b - long) * scale, lat_b - lat
+        dx, dy = bx - ax, by - ay
+        t = 0 if dx == dy == 0 else max(0., min(1., -(ax * dx + ay * dy) / (dx * dx + dy * dy)))
+        distance = min(distance, math.hypot(ax + t * dx, ay + t * dy))
+    return distance * _KM_PER_DEGREE
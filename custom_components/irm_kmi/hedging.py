@@ -0,0 +1,91 @@
+"""Send a second identical request when the first one is slower than usual"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+
+from .const import (DATA_HEDGER, HEDGE_BUDGET_BURST, HEDGE_LATENCY_QUANTILE,
+                    HEDGE_LATENCY_SAMPLES, HEDGE_MAX_RATIO, HEDGE_MIN_SAMPLES)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiHedger:
+    """Process-wide request hedging, shared by all the config entries.
+
+    When a request has not answered after the usual latency of the previous requests (HEDGE_LATENCY_QUANTILE of the
+    last HEDGE_LATENCY_SAMPLES), an identical request is sent.  The first response wins and the other request is
+    cancelled.  Each request adds HEDGE_MAX_RATIO to the budget of extra requests and each extra request uses one, so
+    that at most that fraction of the requests are sent twice.
+    """
+
+    def __init__(self, max_ratio: float = HEDGE_MAX_RATIO, burst: float = HEDGE_BUDGET_BURST) -> None:
+        self._max_ratio = max_ratio
+        self._burst = burst
+        self._budget: float = 0
+        # Seconds taken by the last requests.  A request cancelled because the other one won is counted with the time
+        # it had been waiting: the latency does not drift down because of the hedging itself.
+        self._latencies: Deque[float] = deque(maxlen=HEDGE_LATENCY_SAMPLES)
+        # Number of requests, of extra requests sent and of extra requests answering first
+        self.stats: Dict[str, int] = {'requests': 0, 'hedged': 0, 'hedge_won': 0}
+
+    def delay(self) -> float | None:
+        """Seconds to wait for the first request before sending the second one, None until enough requests are known"""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[max(math.ceil(len(latencies) * HEDGE_LATENCY_QUANTILE) - 1, 0)]
+
+    async def async_call(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Make the call, and the same call again if the first one is too slow.
+
+        :param call: function starting the request
+        :return: result of the first request succeeding
+        :raise: the error of the first request when both fail
+        """
+        self.stats['requests'] += 1
+        self._budget = min(self._budget + self._max_ratio, self._burst)
+        delay = self.delay()
+
+        loop = asyncio.get_running_loop()
+        started = {loop.create_task(call()): time.monotonic()}
+        primary = next(iter(started))
+        try:
+            done, _ = await asyncio.wait(started, timeout=delay)
+            if not done and self._budget >= 1:
+                self._budget -= 1
+                self.stats['hedged'] += 1
+                _LOGGER.debug(f"No response after {delay:.3f} seconds, sending the request again")
+                started[loop.create_task(call())] = time.monotonic()
+
+            pending = set(started)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        self._latencies.append(time.monotonic() - started[task])
+                        if task is not primary:
+                            self.stats['hedge_won'] += 1
+                        return task.result()
+            # Both failed: the error of the request sent first is the most relevant
+            return primary.result()
+        finally:
+            for task, start in started.items():
+                if not task.done():
+                    self._latencies.append(time.monotonic() - start)
+                    task.cancel()
+                elif not task.cancelled():
+                    # The error of the request that lost is expected, it is not logged as never retrieved
+                    task.exception()
+
+
+@singleton(DATA_HEDGER)
+def get_hedger(hass: HomeAssistant) -> IrmKmiHedger:
+    """Get the request hedging shared by all the config entries"""
+    return IrmKmiHedger()
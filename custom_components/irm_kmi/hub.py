@@ -0,0 +1,184 @@
+"""Share data fetched from the IRM KMI API between the config entries of the integration"""
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt
+from irm_kmi_api.data import WarningData
+
+from .api import IrmKmiConditionalApiClient
+from .const import (DATA_DATASET_HUB, DATA_FORECAST_HUB,
+                    FORECAST_CELL_DECIMALS, FORECAST_HUB_MAX_AGE)
+
+_LOGGER = logging.getLogger(__name__)
+
+Cell = Tuple[float, float]
+
+
+class _ForecastCell:
+    """State of the forecast shared by all the coordinators in a grid cell"""
+
+    def __init__(self) -> None:
+        self.forecast: dict | None = None
+        self.refreshed_at: float | None = None
+        self.refreshing: asyncio.Task | None = None
+
+    def age(self) -> float:
+        """Seconds since the last successful refresh of the cell"""
+        return float('inf') if self.refreshed_at is None else time.monotonic() - self.refreshed_at
+
+
+class IrmKmiForecastHub:
+    """Process-wide hub sharing forecast requests between coordinators whose zones fall in the same grid cell.
+
+    The forecast of a cell is downloaded and decoded only once, by the API client of one of its coordinators, and then
+    given to the API clients of the others.  Each coordinator keeps its own client (statistics, cache, options).  A
+    coordinator alone in its cell gets the forecast of its exact coordinates.
+    """
+
+    def __init__(self) -> None:
+        self._cells: Dict[Cell, _ForecastCell] = dict()
+        # Cell of the last refresh of each config entry
+        self._members: Dict[str, Cell] = dict()
+
+    @staticmethod
+    def cell_for(lat: float, long: float) -> Cell:
+        """Get the grid cell containing the given coordinates"""
+        return round(lat, FORECAST_CELL_DECIMALS), round(long, FORECAST_CELL_DECIMALS)
+
+    def age(self, lat: float, long: float) -> float:
+        """Seconds since the forecast of the cell containing the coordinates was received"""
+        cell = self._cells.get(self.cell_for(lat, long))
+        return float('inf') if cell is None else cell.age()
+
+    async def async_refresh(self, entry_id: str, lat: float, long: float, api: IrmKmiConditionalApiClient) -> None:
+        """
+        Make sure the API client has a fresh forecast for the cell containing the coordinates.
+
+        If another coordinator is already fetching the forecast for that cell, wait for its result instead of sending
+        a new request.  If the forecast of the cell is recent enough, it is used as is.
+
+        :param entry_id: config entry of the caller
+        :param lat: latitude of the zone
+        :param long: longitude of the zone
+        :param api: API client of the caller, used to fetch the forecast if a request is needed, and given the forecast
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        key = self.cell_for(lat, long)
+        self._members[entry_id] = key
+        cell = self._cells.setdefault(key, _ForecastCell())
+
+        if cell.refreshing is None:
+            if cell.age() < FORECAST_HUB_MAX_AGE.total_seconds():
+                _LOGGER.debug(f"Reusing forecast for cell {key}")
+                api.set_forecast_data(cell.forecast)
+                return
+
+            alone = all(other == entry_id for other, member_of in self._members.items() if member_of == key)
+            coord = {'lat': lat, 'long': long} if alone else {'lat': key[0], 'long': key[1]}
+            cell.refreshing = asyncio.get_running_loop().create_task(self._async_refresh_cell(cell, api, coord))
+            # Avoid 'exception never retrieved' warnings if every waiting coordinator got cancelled
+            cell.refreshing.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            _LOGGER.debug(f"Waiting for in-flight forecast request for cell {key}")
+
+        await asyncio.shield(cell.refreshing)
+        api.set_forecast_data(cell.forecast)
+
+    def forget(self, entry_id: str) -> None:
+        """The config entry no longer refreshes its forecast: the other entries of its cell may get exact forecasts"""
+        self._members.pop(entry_id, None)
+
+    async def _async_refresh_cell(self, cell: _ForecastCell, api: IrmKmiConditionalApiClient,
+                                  coord: Dict[str, float]) -> None:
+        try:
+            await api.refresh_forecasts_coord(coord)
+            cell.forecast = api.get_forecast_data()
+            cell.refreshed_at = time.monotonic()
+        finally:
+            cell.refreshing = None
+            self._expire_cells()
+
+    def _expire_cells(self) -> None:
+        """Forget about the cells that were not refreshed recently"""
+        expired = [key for key, cell in self._cells.items()
+                   if cell.refreshing is None and cell.age() > 10 * FORECAST_HUB_MAX_AGE.total_seconds()]
+        for key in expired:
+            del self._cells[key]
+
+
+class IrmKmiDatasetHub:
+    """Process-wide hub fetching and parsing the datasets that are the same for many config entries.
+
+    The pollen SVG depends on the municipality only: it is downloaded and parsed once a day per URL, whatever the
+    number of entries.  The warnings are the same for all the zones of a region: they are parsed once per content and
+    language.
+    """
+
+    def __init__(self) -> None:
+        self._pollen: Dict[Tuple[str, date], asyncio.Task] = dict()
+        self._warnings: Dict[Tuple[str, str], Tuple[float, List[WarningData]]] = dict()
+
+    async def async_get_pollen(self, api: IrmKmiConditionalApiClient) -> dict:
+        """
+        Get the pollen data for the forecast of the API client, from the other entries if they already have it today.
+
+        :param api: API client holding the forecast, used to fetch the pollen if needed
+        :return: pollen data as dict mapping from pollen name to pollen level as a color
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        url = api.get_pollen_url()
+        if url is None:
+            return await api.get_pollen()
+
+        today = dt.now().date()
+        self._pollen = {k: task for k, task in self._pollen.items() if k[1] == today}
+
+        key = (url, today)
+        if key not in self._pollen:
+            task = self._pollen[key] = asyncio.get_running_loop().create_task(api.get_pollen())
+            task.add_done_callback(lambda t: self._forget_failed_pollen(key, t))
+        else:
+            _LOGGER.debug(f"Reusing pollen data for {url}")
+
+        return await asyncio.shield(self._pollen[key])
+
+    def get_warnings(self, api: IrmKmiConditionalApiClient, lang: str) -> List[WarningData]:
+        """
+        Get the warnings of the forecast of the API client in the given language, parsed only once for all the entries.
+
+        :param api: API client holding the forecast
+        :param lang: language for the warnings
+        :return: list of warnings
+        """
+        key = (api.get_section_digests().get('for.warning'), lang)
+        now = time.monotonic()
+        self._warnings = {k: v for k, v in self._warnings.items()
+                          if now - v[0] < 10 * FORECAST_HUB_MAX_AGE.total_seconds()}
+
+        if key in self._warnings:
+            warnings = self._warnings[key][1]
+        else:
+            warnings = api.get_warnings(lang)
+        self._warnings[key] = (now, warnings)
+        return warnings
+
+    def _forget_failed_pollen(self, key: Tuple[str, date], task: asyncio.Task) -> None:
+        if (task.cancelled() or task.exception() is not None) and self._pollen.get(key) is task:
+            del self._pollen[key]
+
+
+@singleton(DATA_FORECAST_HUB)
+def get_forecast_hub(hass: HomeAssistant) -> IrmKmiForecastHub:
+    """Get the forecast hub shared by all the config entries"""
+    return IrmKmiForecastHub()
+
+
+@singleton(DATA_DATASET_HUB)
+def get_dataset_hub(hass: HomeAssistant) -> IrmKmiDatasetHub:
+    """Get the dataset hub shared by all the config entries"""
+    return IrmKmiDatasetHub()
@@ -0,0 +1,147 @@
+"""Keep the static radar layers on disk so that they are not downloaded again after a restart"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import urllib.parse
+from typing import Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from irm_kmi_api.api import IrmKmiApiClient
+
+from .const import (DATA_LAYER_CACHE, DOMAIN, LAYER_CACHE_MAX_BYTES,
+                    LAYER_CACHE_SAVE_DELAY, LAYER_CACHE_STORAGE_VERSION)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiLayerCache:
+    """Size-bounded disk cache of the static layers of the rain graph, shared by all the config entries.
+
+    The location layer only depends on the zone, the country and the theme (dark mode): its URL only changes with
+    the daily API key.  Images are saved in files named after the hash of their content, and an index maps each
+    layer (URL without the API key) to its file.  The least recently used layers are evicted when the total size
+    exceeds LAYER_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: str | None = None) -> None:
+        self._hass = hass
+        # The index is saved by the Store in .storage/irm_kmi_layers: the images need a path of their own
+        self._directory = hass.config.path(STORAGE_DIR, f"{DOMAIN}_layers_images") if directory is None else directory
+        self._store: Store = Store(hass, LAYER_CACHE_STORAGE_VERSION, f"{DOMAIN}_layers")
+        self._index: Dict[str, dict] | None = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def is_static(url: str) -> bool:
+        """Tell if the image at the URL is a static layer"""
+        return 's=getLocalizationLayer' in url
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Identify the layer independently of the API key, which changes every day"""
+        parsed = urllib.parse.urlparse(url)
+        query = sorted((k, v) for k, v in urllib.parse.parse_qsl(parsed.query) if k != 'k')
+        return parsed._replace(query=urllib.parse.urlencode(query)).geturl()
+
+    async def async_get_image(self, url: str, api_client: IrmKmiApiClient) -> bytes:
+        """
+        Get the layer from the disk, or download it and save it.
+
+        :param url: URL of the layer
+        :param api_client: API client used to download the layer if it is not on disk
+        :return: image as bytes
+        :raise: IrmKmiApiError when communication with the API fails
+        """
+        key = self.key_for(url)
+        async with self._lock:
+            index = await self._async_get_index()
+            if (entry := index.get(key)) is not None:
+                image = await self._hass.async_add_executor_job(self._read, entry['digest'])
+                if image is not None:
+                    _LOGGER.debug(f"Static layer {key} read from disk")
+                    entry['last_used'] = time.time()
+                    self._schedule_save()
+                    return image
+                del index[key]
+
+        image = await api_client.get_image(url)
+
+        async with self._lock:
+            index = await self._async_get_index()
+            digest = hashlib.sha256(image).hexdigest()
+            await self._hass.async_add_executor_job(self._write, digest, image)
+            index[key] = {'digest': digest, 'size': len(image), 'last_used': time.time()}
+            await self._async_evict(index)
+            # New layers are rare: save the index right away so that the file is used after a restart
+            await self._store.async_save(index)
+        return image
+
+    async def _async_get_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            try:
+                self._index = await self._store.async_load() or dict()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning(f"Could not load the static layers index: {err}")
+                self._index = dict()
+        return self._index
+
+    async def _async_evict(self, index: Dict[str, dict]) -> None:
+        """Remove the least recently used layers until the cache fits in LAYER_CACHE_MAX_BYTES"""
+        sizes = {e['digest']: e['size'] for e in index.values()}
+        by_age = sorted(index.items(), key=lambda item: item[1]['last_used'])
+        while sum(sizes.values()) > LAYER_CACHE_MAX_BYTES and len(by_age) > 1:
+            key, entry = by_age.pop(0)
+            del index[key]
+            if all(e['digest'] != entry['digest'] for e in index.values()):
+                sizes.pop(entry['digest'], None)
+                await self._hass.async_add_executor_job(self._remove, entry['digest'])
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: self._index, LAYER_CACHE_SAVE_DELAY)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self._directory, f"{digest}.png")
+
+    def _read(self, digest: str) -> bytes | None:
+        try:
+            with open(self._path(digest), 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _write(self, digest: str, image: bytes) -> None:
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(self._path(digest), 'wb') as file:
+                file.write(image)
+        except OSError as err:
+            _LOGGER.warning(f"Could not save static layer: {err}")
+
+    def _remove(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except OSError:
+            pass
+
+
+class IrmKmiLayerClient:
+    """API client wrapper reading the static layers from the disk cache and downloading the other images"""
+
+    def __init__(self, layer_cache: IrmKmiLayerCache, api_client: IrmKmiApiClient) -> None:
+        self._layer_cache = layer_cache
+        self._api_client = api_client
+
+    async def get_image(self, url: str, params: Dict[str, str] | None = None) -> bytes:
+        if params is None and self._layer_cache.is_static(url):
+            return await self._layer_cache.async_get_image(url, self._api_client)
+        return await self._api_client.get_image(url, params)
+
+
+@singleton(DATA_LAYER_CACHE)
+def get_layer_cache(hass: HomeAssistant) -> IrmKmiLayerCache:
+    """Get the static layers cache shared by all the config entries"""
+    return IrmKmiLayerCache(hass)
@@ -0,0 +1,94 @@
+"""Learn when new radar frames are published, to refresh right after"""
+import logging
+from datetime import datetime, timedelta
+from typing import List
+
+from .const import PUBLICATION_GUARD, PUBLICATION_MIN_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiPublicationTracker:
+    """Estimate when the next radar frames will be published from the frame times of the forecasts received.
+
+    The animation of each forecast starts at a frame time that moves forward by one cadence (10 minutes) every time
+    new frames are published.  The publication happens some delay after that frame time.  Each refresh bounds that
+    delay: a refresh receiving a new sequence shows the delay is shorter than the time elapsed since the first frame,
+    a refresh receiving the same sequence as before shows the next sequence is published later.  The estimate is in
+    between the tightest bounds, and converges as refreshes happen around it.  A bound contradicted by a new
+    observation (the delay changed) is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._cycle: datetime | None = None
+        self._cadence: timedelta | None = None
+        # Bounds of the publication delay in seconds, after the time of the first frame of the sequence
+        self._upper: float | None = None
+        self._lower: float | None = None
+
+    def observe(self, frame_times: List[datetime], fetched_at: datetime) -> None:
+        """
+        Update the estimate with the radar sequence of a forecast.
+
+        :param frame_times: times of the frames of the radar animation
+        :param fetched_at: when the forecast was received from the API
+        """
+        if len(frame_times) < 2 or frame_times[1] <= frame_times[0]:
+            return
+
+        cycle, cadence = frame_times[0], frame_times[1] - frame_times[0]
+        if self._cycle is None or cycle > self._cycle:
+            upper = (fetched_at - cycle).total_seconds()
+            if self._upper is None or upper < self._upper:
+                self._upper = upper
+                if self._lower is not None and self._lower >= upper:
+                    self._lower = None
+        elif cycle == self._cycle:
+            lower = (fetched_at - (cycle + cadence)).total_seconds()
+            if self._lower is None or lower > self._lower:
+                self._lower = lower
+                if self._upper is not None and self._upper <= lower:
+                    self._upper = None
+        self._cycle, self._cadence = cycle, cadence
+
+    def publication_delay(self) -> timedelta | None:
+        """Estimated delay between the time of the first frame of a sequence and its publication"""
+        if self._upper is None:
+            return None
+        lower = self._lower if self._lower is not None else 0
+        if self._upper - lower <= 2 * PUBLICATION_GUARD.total_seconds():
+            return timedelta(seconds=self._upper)
+        return timedelta(seconds=(lower + self._upper) / 2)
+
+    def next_refresh(self, now: datetime, interval: timedelta, minimum: timedelta,
+                     maximum: timedelta) -> timedelta | None:
+        """
+        Interval until the refresh closest to the wanted one that happens right after new radar frames are published.
+
+        :param now: current time
+        :param interval: wanted interval until the next refresh
+        :param minimum: shortest interval allowed
+        :param maximum: longest interval allowed
+        :return: interval until the next refresh, None if no publication is expected in the allowed range
+        """
+        if (delay := self.publication_delay()) is None:
+            return None
+
+        candidates = list()
+        published = self._cycle + self._cadence + delay + PUBLICATION_GUARD
+        if published <= now:
+            # The next frames are late: try again soon
+            candidates.append(now + max(minimum, PUBLICATION_MIN_DELAY))
+        while published <= now:
+            published += self._cadence
+        while published <= now + maximum:
+            candidates.append(published)
+            published += self._cadence
+
+        candidates = [c for c in candidates if now + max(minimum, PUBLICATION_MIN_DELAY) <= c <= now + maximum]
+        if not candidates:
+            return None
+
+        best = min(candidates, key=lambda c: abs(c - now - interval))
+        _LOGGER.debug(f"Radar frames published {delay} after their first frame, next refresh at {best}")
+        return best - now
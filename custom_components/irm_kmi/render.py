@@ -0,0 +1,96 @@
+"""Build the rain graphs outside of the event loop"""
+import asyncio
+from typing import Callable, List
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from irm_kmi_api.rain_graph import RainGraph
+
+from .const import (CONF_RENDER_WORKERS, DATA_RENDER_POOL, DOMAIN,
+                    RAIN_GRAPH_MAX_WORKERS)
+from .utils import get_config_value
+
+
+class IrmKmiRenderPool:
+    """Build rain graphs in Home Assistant's executor, with at most max_workers graphs built at the same time.
+
+    Building a graph embeds the font and the background image in a large SVG document: it is CPU-bound and would
+    block the event loop for every config entry at every refresh.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_workers: int) -> None:
+        self._hass = hass
+        self._max_workers = max(max_workers, 1)
+        self._running = 0
+        # Builds waiting for a worker, woken up when a worker may be free
+        self._waiters: List[asyncio.Future] = list()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Change the number of graphs built at the same time.  Builds already running are not interrupted."""
+        self._max_workers = max(max_workers, 1)
+        self._wake_up()
+
+    async def async_build(self, factory: Callable[[], RainGraph]) -> RainGraph:
+        """
+        Create and build a rain graph in a worker thread.
+
+        :param factory: function creating the rain graph to build
+        :return: the rain graph, built
+        """
+        while self._running >= self._max_workers:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            await waiter
+        self._running += 1
+
+        # The worker thread cannot be interrupted: when the caller stops waiting (deadline), the worker is only freed
+        # once the thread is done
+        future = self._hass.async_add_executor_job(_build, factory)
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.shield(future)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        """Let the waiting builds check again whether a worker is free"""
+        waiters, self._waiters = self._waiters, list()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+def _build(factory: Callable[[], RainGraph]) -> RainGraph:
+    """
+    Create and build a rain graph, in a worker thread.
+
+    RainGraph.build() only draws: its coroutine completes without ever waiting, so it is run without an event loop.
+    Objects bound to the event loop of Home Assistant (e.g. the HTTP session of the API client given to the graph)
+    cannot be used from the worker thread: a build that waits for I/O is refused instead.
+
+    :raise RuntimeError: when the build waits for I/O
+    """
+    coroutine = factory().build()
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("Building the rain graph waited for I/O: it cannot be done in a worker thread")
+
+
+@singleton(DATA_RENDER_POOL)
+def get_render_pool(hass: HomeAssistant) -> IrmKmiRenderPool:
+    """Get the render pool shared by all the config entries"""
+    return IrmKmiRenderPool(hass, configured_render_workers(hass))
+
+
+def configured_render_workers(hass: HomeAssistant) -> int:
+    """Largest number of rain graphs built at the same time configured in the config entries"""
+    return max((get_config_value(entry, CONF_RENDER_WORKERS, RAIN_GRAPH_MAX_WORKERS)
+                for entry in hass.config_entries.async_entries(DOMAIN)), default=RAIN_GRAPH_MAX_WORKERS)
@@ -6,13 +6,16 @@ from homeassistant import data_entry_flow
 from homeassistant.components.repairs import RepairsFlow
 from homeassistant.const import ATTR_LATITUDE, ATTR_LONGITUDE
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 from irm_kmi_api.api import IrmKmiApiClient
 
 from . import async_reload_entry
 from .const import (OUT_OF_BENELUX, REPAIR_OPT_DELETE, REPAIR_OPT_MOVE,
-                    REPAIR_OPTIONS, REPAIR_SOLUTION, USER_AGENT)
+                    REPAIR_OPTIONS, REPAIR_SOLUTION, USER_AGENT,
+                    VALIDATED_FORECAST_MAX_AGE)
+from .geofence import is_out_of_benelux
+from .session import get_http_session
+from .singleflight import forecast_key, get_single_flight
 from .utils import modify_from_config
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,16 +47,25 @@ class OutOfBeneluxRepairFlow(RepairsFlow):
                 if (zone := self.hass.states.get(self._data['zone'])) is None:
                     errors[REPAIR_SOLUTION] = "zone_not_exist"
 
+                # Zones far from Benelux are rejected without asking the API
+                if not errors and is_out_of_benelux(zone.attributes[ATTR_LATITUDE],
+                                                    zone.attributes[ATTR_LONGITUDE]):
+                    errors[REPAIR_SOLUTION] = 'out_of_benelux'
+
                 if not errors:
                     api_data = {}
                     try:
+                        # The forecast of the exact location is checked: it is kept for the first refresh of the
+                        # entry, right after the flow
+                        lat, long = zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE]
                         async with async_timeout.timeout(10):
-                            api_data = await IrmKmiApiClient(
-                                session=async_get_clientsession(self.hass),
-                                user_agent=USER_AGENT
-                            ).get_forecasts_coord(
-                                {'lat': zone.attributes[ATTR_LATITUDE],
-                                 'long': zone.attributes[ATTR_LONGITUDE]}
+                            api_data = await get_single_flight(self.hass).async_call(
+                                forecast_key(lat, long),
+                                lambda: IrmKmiApiClient(
+                                    session=get_http_session(self.hass).session,
+                                    user_agent=USER_AGENT
+                                ).get_forecasts_coord({'lat': lat, 'long': long}),
+                                ttl=VALIDATED_FORECAST_MAX_AGE.total_seconds()
                             )
                     except Exception:
                         errors[REPAIR_SOLUTION] = 'api_error'
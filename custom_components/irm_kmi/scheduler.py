@@ -0,0 +1,160 @@
+"""Spread the load on the IRM KMI API: refreshes of the config entries and outbound requests"""
+import asyncio
+import hashlib
+import heapq
+import random
+import time
+from datetime import timedelta
+from typing import List, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+
+from .const import (API_RATE_BURST, API_RATE_LIMIT, DATA_RATE_LIMITER,
+                    DATA_SCHEDULER, STAGGER_JITTER)
+
+
+class IrmKmiScheduler:
+    """Process-wide scheduler giving each config entry its own phase in the polling interval.
+
+    Entries are set up at the same time and poll with the same interval: without the scheduler, all of them send
+    their requests in the same second.  Each entry gets a phase derived from its entry id, so that it does not change
+    when other entries are added or removed, and its next refresh is moved to the closest time in its phase (with a
+    bit of jitter) within the minimum and maximum intervals.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[str] = list()
+
+    def register(self, entry_id: str) -> None:
+        """Take the config entry into account when spreading the refreshes"""
+        if entry_id not in self._entries:
+            self._entries.append(entry_id)
+
+    def unregister(self, entry_id: str) -> None:
+        """Forget about the config entry, when it is unloaded"""
+        if entry_id in self._entries:
+            self._entries.remove(entry_id)
+
+    def stagger(self, entry_id: str, interval: timedelta, minimum: timedelta, maximum: timedelta) -> timedelta:
+        """
+        Adjust the interval until the next refresh of the entry so that the refresh happens in the phase of the entry.
+
+        :param entry_id: config entry to refresh
+        :param interval: interval until the next refresh, as computed by the coordinator
+        :param minimum: shortest interval allowed
+        :param maximum: longest interval allowed
+        :return: interval between minimum and maximum, as close as possible to the given interval
+        """
+        if entry_id not in self._entries or len(self._entries) < 2:
+            return interval
+
+        period = interval.total_seconds()
+        spacing = period / len(self._entries)
+        phase = _phase(entry_id) * period + random.uniform(-STAGGER_JITTER, STAGGER_JITTER) * spacing
+
+        # Times in the phase of the entry just before and just after now + interval
+        now = time.time()
+        after = now + period + (phase - now - period) % period
+        allowed = [t - now for t in (after - period, after)
+                   if minimum.total_seconds() <= t - now <= maximum.total_seconds()]
+        if not allowed:
+            return interval
+
+        return timedelta(seconds=min(allowed, key=lambda delay: abs(delay - period)))
+
+    def offset(self, entry_id: str, window: timedelta) -> timedelta:
+        """
+        Offset of the entry in a window shared by all the entries, when they refresh at the same moment.
+
+        :param entry_id: config entry to refresh
+        :param window: duration over which the refreshes of all the entries are spread
+        :return: offset between 0 and the window
+        """
+        if entry_id not in self._entries or len(self._entries) < 2:
+            return timedelta(0)
+
+        spacing = window.total_seconds() / len(self._entries)
+        offset = _phase(entry_id) * window.total_seconds() + random.uniform(0, STAGGER_JITTER) * spacing
+        return timedelta(seconds=offset % window.total_seconds())
+
+
+def _phase(entry_id: str) -> float:
+    """Stable fraction between 0 and 1 for the entry"""
+    return int(hashlib.sha1(entry_id.encode()).hexdigest()[:8], 16) / 2 ** 32
+
+
+class IrmKmiRateLimiter:
+    """Process-wide token bucket limiting the requests sent to the API, serving the most important requests first.
+
+    At most API_RATE_BURST requests are sent at once, then API_RATE_LIMIT per second.  When requests have to wait,
+    they are sent by priority (lowest value first), then in order of arrival.
+    """
+
+    def __init__(self, rate: float = API_RATE_LIMIT, burst: int = API_RATE_BURST) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._tokens: float = burst
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = list()
+        self._sequence = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    async def async_acquire(self, priority: int) -> None:
+        """
+        Wait until a request of the given priority can be sent.
+
+        :param priority: 0 for the most important requests, higher values wait for the lower ones
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self._waiters, (priority, self._sequence, future))
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Got a token but will not use it
+                self._tokens += 1
+                self._release_waiters()
+            raise
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _release_waiters(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self) -> None:
+        if self._wakeup is None and self._waiters:
+            self._wakeup = asyncio.get_running_loop().call_later(max(1 - self._tokens, 0) / self._rate,
+                                                                 self._release_waiters)
+
+
+@singleton(DATA_SCHEDULER)
+def get_scheduler(hass: HomeAssistant) -> IrmKmiScheduler:
+    """Get the refresh scheduler shared by all the config entries"""
+    return IrmKmiScheduler()
+
+
+@singleton(DATA_RATE_LIMITER)
+def get_rate_limiter(hass: HomeAssistant) -> IrmKmiRateLimiter:
+    """Get the rate limiter shared by all the config entries"""
+    return IrmKmiRateLimiter()
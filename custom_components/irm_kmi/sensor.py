@@ -7,7 +7,6 @@ from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt
 from irm_kmi_api.const import POLLEN_NAMES
 from irm_kmi_api.data import IrmKmiForecast, IrmKmiRadarForecast
@@ -17,6 +16,7 @@ from . import DOMAIN, IrmKmiCoordinator
 from .const import (CURRENT_WEATHER_SENSOR_CLASS, CURRENT_WEATHER_SENSOR_ICON,
                     CURRENT_WEATHER_SENSOR_UNITS, CURRENT_WEATHER_SENSORS,
                     POLLEN_TO_ICON_MAP)
+from .entity import IrmKmiCoordinatorEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,9 +33,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         async_add_entities([IrmKmiNextSunMove(coordinator, entry, move) for move in ['sunset', 'sunrise']])
 
 
-class IrmKmiPollen(CoordinatorEntity, SensorEntity):
+class IrmKmiPollen(IrmKmiCoordinatorEntity, SensorEntity):
     """Representation of a pollen sensor"""
     _attr_has_entity_name = True
+    _datasets = ('pollen',)
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_attribution = "Weather data from the Royal Meteorological Institute of Belgium meteo.be"
 
@@ -60,7 +61,7 @@ class IrmKmiPollen(CoordinatorEntity, SensorEntity):
         return self.coordinator.data.get('pollen', {}).get(self._pollen, None)
 
 
-class IrmKmiNextWarning(CoordinatorEntity, SensorEntity):
+class IrmKmiNextWarning(IrmKmiCoordinatorEntity, SensorEntity):
     """Representation of the next weather warning"""
 
     _attr_has_entity_name = True
@@ -95,8 +96,7 @@ class IrmKmiNextWarning(CoordinatorEntity, SensorEntity):
 
         return earliest_next
 
-    @property
-    def extra_state_attributes(self) -> dict:
+    def _extra_attributes(self) -> dict:
         """Return the attributes related to all the future warnings."""
         now = dt.now()
         attrs = {"next_warnings": [w for w in self.coordinator.data.get('warnings', []) if now < w.get('starts_at')]}
@@ -107,7 +107,7 @@ class IrmKmiNextWarning(CoordinatorEntity, SensorEntity):
         return attrs
 
 
-class IrmKmiNextSunMove(CoordinatorEntity, SensorEntity):
+class IrmKmiNextSunMove(IrmKmiCoordinatorEntity, SensorEntity):
     """Representation of the next sunrise or sunset"""
 
     _attr_has_entity_name = True
@@ -142,10 +142,11 @@ class IrmKmiNextSunMove(CoordinatorEntity, SensorEntity):
         return None
 
 
-class IrmKmiCurrentWeather(CoordinatorEntity, SensorEntity):
+class IrmKmiCurrentWeather(IrmKmiCoordinatorEntity, SensorEntity):
     """Representation of a current weather sensor"""
 
     _attr_has_entity_name = True
+    _datasets = ('current_weather',)
     _attr_attribution = "Weather data from the Royal Meteorological Institute of Belgium meteo.be"
 
     def __init__(self,
@@ -178,7 +179,7 @@ class IrmKmiCurrentWeather(CoordinatorEntity, SensorEntity):
         return CURRENT_WEATHER_SENSOR_ICON[self._sensor_name]
 
 
-class IrmKmiCurrentRainfall(CoordinatorEntity, SensorEntity):
+class IrmKmiCurrentRainfall(IrmKmiCoordinatorEntity, SensorEntity):
     """Representation of a current rainfall sensor"""
 
     _attr_has_entity_name = True
@@ -0,0 +1,60 @@
+"""HTTP session dedicated to the IRM KMI API"""
+import logging
+from typing import Dict
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.ssl import client_context
+
+from .const import (DATA_HTTP_SESSION, HTTP_DNS_CACHE_TTL,
+                    HTTP_KEEPALIVE_TIMEOUT, HTTP_LIMIT_PER_HOST)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IrmKmiHttpSession:
+    """aiohttp session used for all the requests to the IRM KMI API, shared by all the config entries.
+
+    The session of Home Assistant is shared with every other integration, with their limits and keep-alive settings.
+    This one keeps the connections to the API hosts open between refreshes, so that the radar frames downloaded by
+    many entries at once reuse warm TLS connections, and caches the DNS resolution of the API hosts.  Compression is
+    negotiated by aiohttp (Accept-Encoding) and responses are decompressed transparently.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        # Number of connections opened and reused, DNS resolutions served from the cache or not
+        self.stats: Dict[str, int] = {'connections_opened': 0, 'connections_reused': 0,
+                                      'dns_cache_hits': 0, 'dns_cache_misses': 0}
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._count('connections_opened'))
+        trace_config.on_connection_reuseconn.append(self._count('connections_reused'))
+        trace_config.on_dns_cache_hit.append(self._count('dns_cache_hits'))
+        trace_config.on_dns_cache_miss.append(self._count('dns_cache_misses'))
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=HTTP_LIMIT_PER_HOST,
+                                           ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                                           keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                                           ssl=client_context()),
+            trace_configs=[trace_config]
+        )
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
+
+    def _count(self, counter: str):
+        async def on_event(_session, _context, _params) -> None:
+            self.stats[counter] += 1
+
+        return on_event
+
+    async def _async_close(self, _event: Event) -> None:
+        _LOGGER.debug(f"Closing HTTP session, statistics: {self.stats}")
+        await self.session.close()
+
+
+@singleton(DATA_HTTP_SESSION)
+def get_http_session(hass: HomeAssistant) -> IrmKmiHttpSession:
+    """Get the HTTP session shared by all the config entries"""
+    return IrmKmiHttpSession(hass)
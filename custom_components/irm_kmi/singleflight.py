@@ -0,0 +1,78 @@
+"""Coalesce identical API calls made at the same time by different parts of the integration"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.singleton import singleton
+from irm_kmi_api.api import IrmKmiApiClient
+
+from .const import DATA_SINGLE_FLIGHT, SINGLE_FLIGHT_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def forecast_key(lat: float, long: float) -> Tuple[str, float, float]:
+    """Key of a getForecasts call for the given coordinates, as rounded by the API client"""
+    return 'getForecasts', round(lat, IrmKmiApiClient.COORD_DECIMALS), round(long, IrmKmiApiClient.COORD_DECIMALS)
+
+
+class IrmKmiSingleFlight:
+    """Process-wide single-flight layer: concurrent callers of the same request await the same call.
+
+    The config flow, the repair flow and the coordinators may request the same forecast at the same time (e.g. when
+    entries are reloaded).  Only one request is sent and its result is shared.  A successful result is also given to
+    the callers arriving shortly after the request completed (SINGLE_FLIGHT_TTL by default).  Failures are never
+    shared with later callers.
+
+    The flows validating a location keep their result longer, so that the first refresh of the coordinator of the new
+    (or moved) entry uses the forecast that was just downloaded instead of requesting it again.
+    """
+
+    def __init__(self) -> None:
+        # Call in flight or completed, with the time it completed (None while in flight) and how long its result
+        # is given to later callers
+        self._calls: Dict[Hashable, Tuple[asyncio.Task, float | None, float]] = dict()
+
+    async def async_call(self, key: Hashable, call: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+        """
+        Make the call, or wait for the result of the identical call in flight.
+
+        :param key: identifies the request (endpoint and parameters)
+        :param call: function starting the request
+        :param ttl: seconds during which the result is given to later callers, SINGLE_FLIGHT_TTL if None
+        :return: result of the request
+        """
+        ttl = SINGLE_FLIGHT_TTL if ttl is None else ttl
+        self._expire()
+
+        if key in self._calls:
+            _LOGGER.debug(f"Joining request in flight or just completed for {key}")
+        else:
+            task = asyncio.get_running_loop().create_task(call())
+            self._calls[key] = (task, None, ttl)
+            task.add_done_callback(lambda t: self._call_done(key, t))
+
+        return await asyncio.shield(self._calls[key][0])
+
+    def _call_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key, (None,))[0] is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            del self._calls[key]
+        else:
+            self._calls[key] = (task, time.monotonic(), self._calls[key][2])
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (_, done_at, ttl) in self._calls.items()
+                   if done_at is not None and now - done_at > ttl]
+        for key in expired:
+            del self._calls[key]
+
+
+@singleton(DATA_SINGLE_FLIGHT)
+def get_single_flight(hass: HomeAssistant) -> IrmKmiSingleFlight:
+    """Get the single-flight layer shared by the whole integration"""
+    return IrmKmiSingleFlight()
@@ -0,0 +1,106 @@
+"""Persist the last data of a coordinator so that Home Assistant restarts start with data"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util.dt import utcnow
+from irm_kmi_api.data import AnimationFrameData, RadarAnimationData
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .data import ProcessedCoordinatorData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys of ProcessedCoordinatorData that can be saved as is in JSON
+_PLAIN_KEYS = ('current_weather', 'hourly_forecast', 'daily_forecast', 'radar_forecast', 'pollen', 'country')
+
+
+class IrmKmiSnapshotStore:
+    """Save and restore a compact snapshot of the data of a coordinator.
+
+    The rain graph is not saved: the radar animation data (frame URLs and rain values) is saved instead so that the
+    coordinator can rebuild the graph without contacting the API.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store = Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    async def async_load(self, fingerprint: dict, max_age: timedelta) \
+            -> Tuple[ProcessedCoordinatorData, RadarAnimationData | None, datetime] | None:
+        """
+        Load the saved snapshot if it exists, is recent enough and was saved with the same configuration.
+
+        :param fingerprint: configuration values that must match the ones used when saving (zone, language, style...)
+        :param max_age: snapshots older than this are ignored
+        :return: tuple (data, radar animation data, time of the save) or None if no usable snapshot exists
+        """
+        try:
+            snapshot = await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning(f"Could not load saved data: {err}")
+            return None
+
+        if snapshot is None or snapshot.get('fingerprint') != fingerprint:
+            return None
+
+        try:
+            saved_at = datetime.fromisoformat(snapshot['saved_at'])
+            if utcnow() - saved_at > max_age:
+                _LOGGER.debug(f"Ignoring saved data from {saved_at}: too old")
+                return None
+
+            data = ProcessedCoordinatorData(**{k: v for k, v in snapshot['data'].items() if k in _PLAIN_KEYS})
+            data['warnings'] = [w | {'starts_at': datetime.fromisoformat(w['starts_at']),
+                                     'ends_at': datetime.fromisoformat(w['ends_at'])}
+                                for w in snapshot['data'].get('warnings', [])]
+
+            animation = snapshot.get('animation')
+            if animation is not None:
+                animation = RadarAnimationData(**animation)
+                animation['sequence'] = [AnimationFrameData(**f | {'time': _from_iso(f['time'])})
+                                         for f in animation['sequence']]
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning(f"Saved data is not valid, ignoring it: {err}")
+            return None
+
+        return data, animation, saved_at
+
+    def async_delay_save(self,
+                         fingerprint: dict,
+                         data: ProcessedCoordinatorData,
+                         animation: RadarAnimationData | None) -> None:
+        """Schedule saving the snapshot.  Successive calls within SNAPSHOT_SAVE_DELAY result in a single write."""
+        self._store.async_delay_save(lambda: self._serialize(fingerprint, data, animation), SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the saved snapshot"""
+        await self._store.async_remove()
+
+    @staticmethod
+    def _serialize(fingerprint: dict,
+                   data: ProcessedCoordinatorData,
+                   animation: RadarAnimationData | None) -> Dict[str, Any]:
+        saved = {k: data[k] for k in _PLAIN_KEYS if k in data}
+        saved['warnings'] = [w | {'starts_at': w['starts_at'].isoformat(), 'ends_at': w['ends_at'].isoformat()}
+                             for w in data.get('warnings', [])]
+
+        if animation is not None:
+            animation = animation | {'sequence': [f | {'time': _to_iso(f['time'])}
+                                                  for f in animation.get('sequence', [])]}
+
+        return {
+            'saved_at': utcnow().isoformat(),
+            'fingerprint': fingerprint,
+            'data': saved,
+            'animation': animation
+        }
+
+
+def _to_iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _from_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
@@ -27,9 +27,11 @@ def modify_from_config(hass: HomeAssistant, config_entry_id: str, enable: bool):
                                disabled_by=None if enable else device_registry.DeviceEntryDisabler.INTEGRATION)
 
 
-def get_config_value(config_entry: ConfigEntry, key: str) -> Any:
+def get_config_value(config_entry: ConfigEntry, key: str, default: Any = None) -> Any:
     if config_entry.options and key in config_entry.options:
         return config_entry.options[key]
+    if default is not None:
+        return config_entry.data.get(key, default)
     return config_entry.data[key]
 
 
@@ -13,7 +13,6 @@ from homeassistant.core import HomeAssistant, SupportsResponse
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt
 
 from . import CONF_USE_DEPRECATED_FORECAST, DOMAIN
@@ -22,6 +21,7 @@ from .const import (OPTION_DEPRECATED_FORECAST_DAILY,
                     OPTION_DEPRECATED_FORECAST_NOT_USED,
                     OPTION_DEPRECATED_FORECAST_TWICE_DAILY)
 from .coordinator import IrmKmiCoordinator
+from .entity import IrmKmiCoordinatorEntity
 from .utils import get_config_value
 
 _LOGGER = logging.getLogger(__name__)
@@ -48,8 +48,9 @@ def add_services() -> None:
     )
 
 
-class IrmKmiWeather(CoordinatorEntity, WeatherEntity):
+class IrmKmiWeather(IrmKmiCoordinatorEntity, WeatherEntity):
     _attr_attribution = "Weather data from the Royal Meteorological Institute of Belgium meteo.be"
+    _datasets = ('current_weather', 'daily_forecast', 'hourly_forecast')
 
     def __init__(self,
                  coordinator: IrmKmiCoordinator,
@@ -168,8 +169,7 @@ class IrmKmiWeather(CoordinatorEntity, WeatherEntity):
                 if include_past_forecasts or datetime.fromisoformat(f.get('datetime')) >= now]
 
     # TODO remove on next breaking changes
-    @property
-    def extra_state_attributes(self) -> dict:
+    def _extra_attributes(self) -> dict:
         """Here to keep the DEPRECATED forecast attribute.
         This attribute is deprecated by Home Assistant by still implemented for compatibility
         with older components.  Newer components should use the service weather.get_forecasts instead.
@@ -0,0 +1,215 @@
+"""Benchmark the processing of the forecasts: IrmKmiCoordinator.process_api_data and each of its stages.
+
+Every JSON fixture of tests/fixtures is processed, and every SVG fixture is parsed as pollen data.  The time (median
+and minimum of the runs) and the peak of memory allocated (tracemalloc) are reported for each stage, as JSON:
+
+    python -m tests.benchmark --repeat 20 --output benchmark-0.3.2.json
+
+Time and memory are measured in separate runs: tracemalloc slows the code down.  process_api_data is measured cold
+(new coordinator, nothing cached) and warm (same forecast again, parsed sections and rain graph reused).  No request
+is sent: the pollen SVG is given to the API client and radar images are not downloaded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.const import CONF_ZONE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+from irm_kmi_api.const import OPTION_STYLE_STD
+from irm_kmi_api.pollen import PollenParser
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry, async_test_home_assistant)
+
+from custom_components.irm_kmi.api import IrmKmiConditionalApiClient
+from custom_components.irm_kmi.const import (
+    CONF_DARK_MODE, CONF_LANGUAGE_OVERRIDE, CONF_STYLE,
+    CONF_USE_DEPRECATED_FORECAST, DATA_DATASET_HUB, DOMAIN,
+    IRM_KMI_TO_HA_CONDITION_MAP, OPTION_DEPRECATED_FORECAST_NOT_USED)
+from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+MANIFEST = os.path.join(os.path.dirname(__file__), '..', 'custom_components', 'irm_kmi', 'manifest.json')
+# Pollen SVG given to the API client by process_api_data
+POLLEN_FIXTURE = 'pollen.svg'
+
+
+def _read(fixture: str) -> str:
+    with open(os.path.join(FIXTURES, fixture)) as file:
+        return file.read()
+
+
+def _api(forecast: dict, pollen_svg: str) -> IrmKmiConditionalApiClient:
+    api = IrmKmiConditionalApiClient(session=MagicMock(), user_agent='', cdt_map=IRM_KMI_TO_HA_CONDITION_MAP)
+    api._api_data = forecast
+    api.get_svg = AsyncMock(return_value=pollen_svg)
+    return api
+
+
+def _config_entry() -> MockConfigEntry:
+    return MockConfigEntry(
+        title="Benchmark",
+        domain=DOMAIN,
+        data={CONF_ZONE: "zone.home",
+              CONF_STYLE: OPTION_STYLE_STD,
+              CONF_DARK_MODE: True,
+              CONF_USE_DEPRECATED_FORECAST: OPTION_DEPRECATED_FORECAST_NOT_USED,
+              CONF_LANGUAGE_OVERRIDE: 'none'},
+        unique_id="zone.home",
+    )
+
+
+async def _measure(run: Callable[[], Awaitable[Any]], setup: Callable[[], Awaitable[Any]], repeat: int) -> dict:
+    """
+    Time and memory of run(), each run after a call to setup() (not measured).
+
+    :return: dict with the median and minimum time in seconds, and the peak of memory allocated in bytes
+    """
+    times: List[float] = list()
+    for _ in range(repeat):
+        await setup()
+        start = time.perf_counter()
+        await run()
+        times.append(time.perf_counter() - start)
+
+    await setup()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        await run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time_median_s': statistics.median(times), 'time_min_s': min(times), 'alloc_peak_bytes': peak - before}
+
+
+async def _nothing() -> None:
+    pass
+
+
+def _sync(function: Callable[[], Any]) -> Callable[[], Awaitable[Any]]:
+    async def run() -> Any:
+        return function()
+    return run
+
+
+async def benchmark_forecast(hass: HomeAssistant, fixture: str, repeat: int) -> Dict[str, dict]:
+    """
+    Benchmark process_api_data and the parsers of the API client on the forecast of a JSON fixture.
+
+    :return: dict mapping the name of the stage to its measures, or to the error raised by the stage
+    """
+    forecast = json.loads(_read(fixture))
+    pollen_svg = _read(POLLEN_FIXTURE)
+    tz = await dt.async_get_time_zone('Europe/Brussels')
+    lang = 'en'
+    api = _api(forecast, pollen_svg)
+
+    stages: Dict[str, Callable[[], Awaitable[Any]]] = {
+        'get_current_weather': _sync(lambda: api.get_current_weather(tz)),
+        'get_daily_forecast': _sync(lambda: api.get_daily_forecast(tz, lang)),
+        'get_hourly_forecast': _sync(lambda: api.get_hourly_forecast(tz)),
+        'get_radar_forecast': _sync(lambda: api.get_radar_forecast()),
+        'get_warnings': _sync(lambda: api.get_warnings(lang)),
+    }
+    results: Dict[str, dict] = dict()
+    for name, run in stages.items():
+        results[name] = await _measure_or_error(run, _nothing, repeat)
+
+    coordinator: IrmKmiCoordinator | None = None
+
+    async def new_coordinator() -> None:
+        nonlocal coordinator
+        if coordinator is not None:
+            await coordinator.async_shutdown()
+        # Datasets shared by the entries (pollen, warnings) are not reused between runs
+        hass.data.pop(DATA_DATASET_HUB, None)
+        coordinator = IrmKmiCoordinator(hass, _config_entry())
+        coordinator._api = _api(forecast, pollen_svg)
+
+    async def process() -> None:
+        coordinator.data = await coordinator.process_api_data()
+
+    async def warm_coordinator() -> None:
+        await new_coordinator()
+        await process()
+
+    results['process_api_data'] = await _measure_or_error(process, new_coordinator, repeat)
+    results['process_api_data_warm'] = await _measure_or_error(process, warm_coordinator, repeat)
+    if coordinator is not None:
+        await coordinator.async_shutdown()
+    return results
+
+
+async def benchmark_pollen(fixture: str, repeat: int) -> dict:
+    """Benchmark the parsing of the pollen SVG of a fixture"""
+    svg = _read(fixture)
+    return await _measure_or_error(_sync(lambda: PollenParser(svg).get_pollen_data()), _nothing, repeat)
+
+
+async def _measure_or_error(run: Callable[[], Awaitable[Any]], setup: Callable[[], Awaitable[Any]],
+                            repeat: int) -> dict:
+    try:
+        return await _measure(run, setup, repeat)
+    except Exception as err:  # pylint: disable=broad-except
+        # Some fixtures are not complete forecasts: the stages that cannot use them are reported as such
+        return {'error': f"{type(err).__name__}: {err}"}
+
+
+async def run_benchmark(hass: HomeAssistant, repeat: int, fixtures: List[str] | None = None) -> dict:
+    """
+    Benchmark all the fixtures (or the given ones).
+
+    :return: machine-readable results: environment, then the measures by fixture and by stage
+    """
+    fixtures = sorted(os.listdir(FIXTURES)) if fixtures is None else fixtures
+    with open(MANIFEST) as file:
+        version = json.load(file)['version']
+
+    results: Dict[str, Any] = {
+        'version': version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'forecasts': dict(),
+        'pollen': dict()
+    }
+    for fixture in fixtures:
+        if fixture.endswith('.json'):
+            results['forecasts'][fixture] = await benchmark_forecast(hass, fixture, repeat)
+        elif fixture.endswith('.svg'):
+            results['pollen'][fixture] = await benchmark_pollen(fixture, repeat)
+    return results
+
+
+async def _main(args: argparse.Namespace) -> None:
+    async with async_test_home_assistant() as hass:
+        results = await run_benchmark(hass, args.repeat, args.fixture or None)
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10, help="timed runs of each stage")
+    parser.add_argument('--fixture', action='append', help="fixture to benchmark (all of them by default)")
+    parser.add_argument('--output', help="JSON file to write the results to (standard output by default)")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
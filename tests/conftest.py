@@ -8,13 +8,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.const import CONF_ZONE
-from irm_kmi_api.api import (IrmKmiApiClientHa, IrmKmiApiError,
-                             IrmKmiApiParametersError)
+from irm_kmi_api.api import IrmKmiApiError, IrmKmiApiParametersError
 from irm_kmi_api.data import AnimationFrameData, RadarAnimationData
 from pytest_homeassistant_custom_component.common import (MockConfigEntry,
                                                           load_fixture)
 
 from custom_components.irm_kmi import OPTION_STYLE_STD
+from custom_components.irm_kmi.api import IrmKmiConditionalApiClient
 from custom_components.irm_kmi.const import (
     CONF_DARK_MODE, CONF_LANGUAGE_OVERRIDE, CONF_STYLE,
     CONF_USE_DEPRECATED_FORECAST, DOMAIN, IRM_KMI_TO_HA_CONDITION_MAP,
@@ -26,8 +26,8 @@ def get_api_data(fixture: str) -> dict:
     return json.loads(load_fixture(fixture))
 
 
-def get_api_with_data(fixture: str) -> IrmKmiApiClientHa:
-    api = IrmKmiApiClientHa(session=MagicMock(), user_agent='', cdt_map=IRM_KMI_TO_HA_CONDITION_MAP)
+def get_api_with_data(fixture: str) -> IrmKmiConditionalApiClient:
+    api = IrmKmiConditionalApiClient(session=MagicMock(), user_agent='', cdt_map=IRM_KMI_TO_HA_CONDITION_MAP)
     api._api_data = get_api_data(fixture)
     return api
 
@@ -115,11 +115,20 @@ def mock_irm_kmi_api(request: pytest.FixtureRequest) -> Generator[None, MagicMoc
 
     forecast = json.loads(load_fixture(fixture))
     with patch(
-            "custom_components.irm_kmi.coordinator.IrmKmiApiClientHa", autospec=True
+            "custom_components.irm_kmi.coordinator.IrmKmiConditionalApiClient", autospec=True
     ) as irm_kmi_api_mock:
         irm_kmi = irm_kmi_api_mock.return_value
         irm_kmi.get_forecasts_coord.return_value = forecast
         irm_kmi.get_radar_forecast.return_value = {}
+        # Parsed data is saved to disk: it must not contain mocks
+        irm_kmi.get_current_weather.return_value = {}
+        irm_kmi.get_daily_forecast.return_value = []
+        irm_kmi.get_hourly_forecast.return_value = []
+        irm_kmi.get_warnings.return_value = []
+        irm_kmi.get_pollen.return_value = {}
+        irm_kmi.get_country.return_value = 'BE'
+        irm_kmi.get_city.return_value = 'Brussels'
+        irm_kmi.get_animation_data.side_effect = ValueError
         yield irm_kmi
 
 
@@ -155,7 +164,7 @@ def mock_irm_kmi_api_repair_out_of_benelux(request: pytest.FixtureRequest) -> Ge
 def mock_exception_irm_kmi_api(request: pytest.FixtureRequest) -> Generator[None, MagicMock, None]:
     """Return a mocked IrmKmi api client."""
     with patch(
-            "custom_components.irm_kmi.coordinator.IrmKmiApiClientHa", autospec=True
+            "custom_components.irm_kmi.coordinator.IrmKmiConditionalApiClient", autospec=True
     ) as irm_kmi_api_mock:
         irm_kmi = irm_kmi_api_mock.return_value
         irm_kmi.refresh_forecasts_coord.side_effect = IrmKmiApiParametersError
@@ -0,0 +1,305 @@
+"""Record exchanges with the IRM KMI API in a bundle, and replay them from a local stand-in server.
+
+Record a bundle (forecast, pollen SVG and radar images of a location) from the real API:
+
+    python -m tests.replay record --lat 50.85 --long 4.35 tests/fixtures/bundles/brussels
+
+Serve it locally, with latency and errors:
+
+    python -m tests.replay serve tests/fixtures/bundles/brussels --latency 0.5 --jitter 0.2 --error-rate 0.05
+
+The stand-in server answers on http://127.0.0.1:<port>/<host>/<path>: clients are pointed at it with
+IrmKmiStandInSession, and the whole integration (coordinator, config flow, repair flow) with use_stand_in().
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Tuple
+
+import aiohttp
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+from yarl import URL
+
+from custom_components.irm_kmi.api import IrmKmiConditionalApiClient
+from custom_components.irm_kmi.const import DATA_HTTP_SESSION
+from custom_components.irm_kmi.const import \
+    IRM_KMI_TO_HA_CONDITION_MAP as CDT_MAP
+from custom_components.irm_kmi.const import OPTION_STYLE_STD, USER_AGENT
+
+_LOGGER = logging.getLogger(__name__)
+
+BUNDLE_INDEX = 'bundle.json'
+# Response headers kept in the bundle
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+# The API key changes every day: it is not part of the request identity
+IGNORED_PARAMS = ('k',)
+
+Key = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def request_key(url: str | URL, params: dict | None = None) -> Key:
+    """Identity of a request: host, path and parameters (from the URL and the params) except the API key"""
+    url = URL(url)
+    query = dict(url.query) | {k: str(v) for k, v in (params or {}).items()}
+    return url.host, url.path, tuple(sorted((k, v) for k, v in query.items() if k not in IGNORED_PARAMS))
+
+
+@dataclass
+class Exchange:
+    """A request and the response recorded for it, the body being in a file of the bundle"""
+    host: str
+    path: str
+    params: Dict[str, str]
+    status: int
+    headers: Dict[str, str]
+    body: str
+
+    def key(self) -> Key:
+        return self.host, self.path, tuple(sorted(self.params.items()))
+
+
+@dataclass
+class IrmKmiBundle:
+    """Exchanges with the API saved in a directory: an index (bundle.json) and one file per response body"""
+    directory: str
+    exchanges: List[Exchange] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, directory: str) -> 'IrmKmiBundle':
+        with open(os.path.join(directory, BUNDLE_INDEX)) as file:
+            return cls(directory, [Exchange(**e) for e in json.load(file)])
+
+    def save(self) -> None:
+        with open(os.path.join(self.directory, BUNDLE_INDEX), 'w') as file:
+            json.dump([asdict(e) for e in self.exchanges], file, indent=2)
+
+    def add(self, url: str | URL, params: dict | None, status: int, headers: dict, body: bytes) -> Exchange:
+        """Save the response body in the bundle and add the exchange, replacing the one of the same request"""
+        host, path, query = request_key(url, params)
+        name = hashlib.sha1(repr((host, path, query)).encode()).hexdigest()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), 'wb') as file:
+            file.write(body)
+
+        exchange = Exchange(host=host, path=path, params=dict(query), status=status,
+                            headers={k: headers[k] for k in RECORDED_HEADERS if k in headers}, body=name)
+        self.exchanges = [e for e in self.exchanges if e.key() != exchange.key()] + [exchange]
+        return exchange
+
+    def find(self, host: str, path: str, params: dict) -> Exchange | None:
+        """
+        Exchange recorded for the request.  Requests with other parameters are answered with the exchange of the same
+        API method (e.g. the forecast of another location), if any.
+        """
+        key = request_key(URL.build(scheme='https', host=host, path=path), params)
+        for exchange in self.exchanges:
+            if exchange.key() == key:
+                return exchange
+        for exchange in self.exchanges:
+            if (exchange.host, exchange.path) == (host, path) and exchange.params.get('s') == params.get('s'):
+                return exchange
+        return None
+
+    def read(self, exchange: Exchange) -> bytes:
+        with open(os.path.join(self.directory, exchange.body), 'rb') as file:
+            return file.read()
+
+
+class IrmKmiRecordingSession:
+    """Transport recording the responses received through an aiohttp session in a bundle.
+
+    It only offers request(), the method used by the API clients.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, bundle: IrmKmiBundle) -> None:
+        self._session = session
+        self.bundle = bundle
+
+    async def request(self, method: str, url: str | URL, params: dict | None = None,
+                      **kwargs) -> aiohttp.ClientResponse:
+        response = await self._session.request(method, url, params=params, **kwargs)
+        # The body is kept by the response: the API client can still read it
+        body = await response.read()
+        if method.lower() == 'get' and response.status == 200:
+            self.bundle.add(url, params, response.status, dict(response.headers), body)
+        return response
+
+
+class IrmKmiStandInSession:
+    """Transport sending the requests for any host to the stand-in server, through an aiohttp session"""
+
+    def __init__(self, session: aiohttp.ClientSession, server_url: str | URL) -> None:
+        self._session = session
+        self._server_url = URL(server_url)
+
+    def url_for(self, url: str | URL) -> URL:
+        url = URL(url)
+        return self._server_url.with_path(f"/{url.host}{url.path}").with_query(url.query)
+
+    async def request(self, method: str, url: str | URL, **kwargs) -> aiohttp.ClientResponse:
+        return await self._session.request(method, self.url_for(url), **kwargs)
+
+
+class IrmKmiStandInServer:
+    """Local aiohttp server answering the requests with the exchanges of a bundle.
+
+    :param latency: seconds before the response starts
+    :param jitter: the latency varies randomly by up to this many seconds
+    :param error_rate: fraction of the requests answered with 503 Service Unavailable
+    :param chunk_size: the body is sent in chunks of this many bytes...
+    :param chunk_delay: ...with this many seconds between them (slow body)
+    """
+
+    def __init__(self, bundle: IrmKmiBundle, latency: float = 0, jitter: float = 0, error_rate: float = 0,
+                 chunk_size: int = 16 * 1024, chunk_delay: float = 0, seed: int | None = None) -> None:
+        self.bundle = bundle
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self.url: URL | None = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/{host}/{path:.*}', self._handle)
+
+    async def __aenter__(self) -> 'IrmKmiStandInServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.url = URL.build(scheme='http', host=host, port=self._runner.addresses[0][1])
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def session(self, session: aiohttp.ClientSession) -> IrmKmiStandInSession:
+        """Transport sending the requests of the given session to this server"""
+        return IrmKmiStandInSession(session, self.url)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            return web.Response(status=503)
+
+        exchange = self.bundle.find(request.match_info['host'], f"/{request.match_info['path']}",
+                                    dict(request.query))
+        if exchange is None:
+            return web.Response(status=404)
+
+        etag = exchange.headers.get('ETag')
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers=exchange.headers)
+
+        body = self.bundle.read(exchange)
+        response = web.StreamResponse(status=exchange.status, headers=exchange.headers)
+        response.content_length = len(body)
+        await response.prepare(request)
+        for start in range(0, len(body), self.chunk_size):
+            if start and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            await response.write(body[start:start + self.chunk_size])
+        await response.write_eof()
+        return response
+
+
+class _StandInHttpSession:
+    """Replaces the HTTP session of the integration (see session.py)"""
+
+    def __init__(self, session: IrmKmiStandInSession) -> None:
+        self.session = session
+        self.stats: Dict[str, int] = dict()
+
+
+def use_stand_in(hass: HomeAssistant, server: IrmKmiStandInServer, session: aiohttp.ClientSession) -> None:
+    """Send the requests of the integration (coordinators, config and repair flows) to the stand-in server.  Must be
+    called before the integration uses its HTTP session."""
+    hass.data[DATA_HTTP_SESSION] = _StandInHttpSession(server.session(session))
+
+
+async def record_bundle(directory: str, lat: float, long: float) -> IrmKmiBundle:
+    """
+    Record the forecast of the location, the pollen SVG and the radar images from the real API.
+
+    The warnings are part of the forecast.
+
+    :param directory: where to save the bundle
+    :return: the bundle saved
+    """
+    bundle = IrmKmiBundle(directory)
+    async with aiohttp.ClientSession() as session:
+        api = IrmKmiConditionalApiClient(IrmKmiRecordingSession(session, bundle), USER_AGENT, CDT_MAP)
+        await api.refresh_forecasts_coord({'lat': lat, 'long': long})
+        await api.get_pollen()
+
+        tz = await dt.async_get_time_zone('Europe/Brussels')
+        animation = api.get_animation_data(tz, 'en', OPTION_STYLE_STD, True)
+        for url in [f['image'] for f in animation['sequence']] + [animation['location']]:
+            await api.get_image(url)
+
+    bundle.save()
+    _LOGGER.info(f"Recorded {len(bundle.exchanges)} exchanges in {directory}")
+    return bundle
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = IrmKmiStandInServer(IrmKmiBundle.load(args.bundle), latency=args.latency, jitter=args.jitter,
+                                 error_rate=args.error_rate, chunk_size=args.chunk_size, chunk_delay=args.chunk_delay)
+    await server.start(port=args.port)
+    print(f"Serving {args.bundle} on {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="record a bundle from the real API")
+    record.add_argument('bundle', help="directory of the bundle")
+    record.add_argument('--lat', type=float, required=True)
+    record.add_argument('--long', type=float, required=True)
+
+    serve = commands.add_parser('serve', help="serve a bundle from a local stand-in server")
+    serve.add_argument('bundle', help="directory of the bundle")
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--latency', type=float, default=0, help="seconds before each response")
+    serve.add_argument('--jitter', type=float, default=0, help="random variation of the latency in seconds")
+    serve.add_argument('--error-rate', type=float, default=0, help="fraction of the requests failing with 503")
+    serve.add_argument('--chunk-size', type=int, default=16 * 1024, help="size of the chunks of the body in bytes")
+    serve.add_argument('--chunk-delay', type=float, default=0, help="seconds between the chunks of the body")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'record':
+        asyncio.run(record_bundle(args.bundle, args.lat, args.long))
+    else:
+        asyncio.run(_serve(args))
+
+
+if __name__ == '__main__':
+    main()
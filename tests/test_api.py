@@ -0,0 +1,56 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.irm_kmi.api import IrmKmiConditionalApiClient
+from custom_components.irm_kmi.const import IRM_KMI_TO_HA_CONDITION_MAP
+from tests.conftest import load_fixture
+
+
+def _response(status: int, headers: dict, body: bytes = b'') -> MagicMock:
+    response = MagicMock()
+    response.status = status
+    response.headers = headers
+    response.read = AsyncMock(return_value=body)
+    return response
+
+
+def _api(*responses: MagicMock) -> IrmKmiConditionalApiClient:
+    session = MagicMock()
+    session.request = AsyncMock(side_effect=list(responses))
+    return IrmKmiConditionalApiClient(session=session, user_agent='test', cdt_map=IRM_KMI_TO_HA_CONDITION_MAP)
+
+
+async def test_not_modified_forecast_is_not_parsed_again() -> None:
+    body = load_fixture("forecast.json").encode()
+    api = _api(_response(200, {'ETag': '"v1"', 'Last-Modified': 'Fri, 12 Jan 2024 06:50:00 GMT'}, body),
+               _response(304, {}))
+
+    first = await api.get_forecasts_coord({'lat': 50.738681639, 'long': 4.054077148})
+    second = await api.get_forecasts_coord({'lat': 50.738681639, 'long': 4.054077148})
+
+    assert first == json.loads(body)
+    assert second is first
+    assert api.http_stats['forecast']['not_modified'] == 1
+    assert api.http_stats['forecast']['bytes'] == len(body)
+    headers = api._session.request.call_args.kwargs['headers']
+    assert headers['If-None-Match'] == '"v1"'
+    assert headers['If-Modified-Since'] == 'Fri, 12 Jan 2024 06:50:00 GMT'
+
+
+async def test_fresh_response_is_not_requested_again() -> None:
+    api = _api(_response(200, {'Cache-Control': 'public, max-age=600'}, b'<svg/>'))
+
+    assert await api.get_svg("https://example.com/pollen.svg") == '<svg/>'
+    assert await api.get_svg("https://example.com/pollen.svg") == '<svg/>'
+
+    assert api._session.request.call_count == 1
+    assert api.http_stats['svg'] == {'requests': 1, 'not_modified': 0, 'fresh': 1, 'bytes': 6}
+
+
+async def test_no_cache_response_is_requested_again() -> None:
+    api = _api(_response(200, {'Cache-Control': 'no-cache, max-age=600'}, b'1'),
+               _response(200, {'Cache-Control': 'no-cache, max-age=600'}, b'2'))
+
+    assert await api.get_image("https://example.com/frame.png") == b'1'
+    assert await api.get_image("https://example.com/frame.png") == b'2'
+    assert api._session.request.call_count == 2
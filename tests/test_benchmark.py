@@ -0,0 +1,21 @@
+import json
+
+from homeassistant.core import HomeAssistant
+
+from tests.benchmark import run_benchmark
+
+
+async def test_benchmark_reports_each_stage(hass: HomeAssistant) -> None:
+    results = await run_benchmark(hass, 1, ['forecast.json', 'pollen.svg'])
+
+    stages = results['forecasts']['forecast.json']
+    assert set(stages.keys()) == {'get_current_weather', 'get_daily_forecast', 'get_hourly_forecast',
+                                  'get_radar_forecast', 'get_warnings', 'process_api_data',
+                                  'process_api_data_warm'}
+    for measures in list(stages.values()) + [results['pollen']['pollen.svg']]:
+        assert 'error' not in measures
+        assert measures['time_min_s'] <= measures['time_median_s']
+        assert measures['alloc_peak_bytes'] >= 0
+
+    # Results are compared across versions: they must be serializable
+    assert json.loads(json.dumps(results)) == results
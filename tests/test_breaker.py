@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.irm_kmi.breaker import (IrmKmiCircuitBreaker,
+                                               IrmKmiCircuitOpenError)
+from custom_components.irm_kmi.const import (BREAKER_FAILURE_THRESHOLD,
+                                             BREAKER_MIN_BACKOFF)
+
+
+def _fail(breaker: IrmKmiCircuitBreaker) -> None:
+    with pytest.raises(asyncio.TimeoutError):
+        with breaker.guard('app.meteo.be'):
+            raise asyncio.TimeoutError
+
+
+def test_circuit_opens_then_half_open_probe_closes_it() -> None:
+    breaker = IrmKmiCircuitBreaker()
+
+    with patch('custom_components.irm_kmi.breaker.time.monotonic', return_value=1000):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            _fail(breaker)
+
+        # Open: requests fail without being sent
+        with pytest.raises(IrmKmiCircuitOpenError):
+            with breaker.guard('app.meteo.be'):
+                pytest.fail("Request sent while the circuit is open")
+        assert breaker.retry_in('app.meteo.be') > 0
+
+        # Other hosts are not affected
+        with breaker.guard('other.host'):
+            pass
+
+    with patch('custom_components.irm_kmi.breaker.time.monotonic',
+               return_value=1000 + 2 * BREAKER_MIN_BACKOFF.total_seconds()):
+        # Half-open: a single probe is let through
+        with breaker.guard('app.meteo.be'):
+            with pytest.raises(IrmKmiCircuitOpenError):
+                with breaker.guard('app.meteo.be'):
+                    pass
+
+        # The probe succeeded: requests are sent normally
+        assert breaker.retry_in('app.meteo.be') == 0
+        with breaker.guard('app.meteo.be'):
+            pass
+
+
+def test_failed_probe_doubles_the_backoff() -> None:
+    breaker = IrmKmiCircuitBreaker()
+
+    with patch('custom_components.irm_kmi.breaker.time.monotonic', return_value=1000):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            _fail(breaker)
+        first_backoff = breaker.retry_in('app.meteo.be')
+
+    with patch('custom_components.irm_kmi.breaker.time.monotonic', return_value=1000 + first_backoff):
+        _fail(breaker)
+        assert breaker.retry_in('app.meteo.be') > first_backoff
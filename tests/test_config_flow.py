@@ -1,20 +1,33 @@
 """Tests for the IRM KMI config flow."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import pytest
 from homeassistant.components.zone import ENTITY_ID_HOME
 from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import CONF_ZONE
 from homeassistant.core import HomeAssistant
-from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.data_entry_flow import FlowResultType, InvalidData
 from irm_kmi_api.const import OPTION_STYLE_SATELLITE, OPTION_STYLE_STD
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.irm_kmi import async_migrate_entry
 from custom_components.irm_kmi.const import (
-    CONF_DARK_MODE, CONF_LANGUAGE_OVERRIDE, CONF_STYLE,
-    CONF_USE_DEPRECATED_FORECAST, CONFIG_FLOW_VERSION, DOMAIN,
-    OPTION_DEPRECATED_FORECAST_NOT_USED)
+    CONF_DARK_MODE, CONF_FORECAST_DEADLINE, CONF_HEDGE_REQUESTS,
+    CONF_LANGUAGE_OVERRIDE, CONF_MAX_UPDATE_INTERVAL, CONF_MIN_UPDATE_INTERVAL,
+    CONF_POLLEN_DEADLINE, CONF_RADAR_DEADLINE, CONF_RENDER_DEADLINE,
+    CONF_RENDER_WORKERS, CONF_STALE_DATA_MAX_AGE, CONF_STYLE,
+    CONF_USE_DEPRECATED_FORECAST, CONFIG_FLOW_VERSION,
+    DEFAULT_FORECAST_DEADLINE, DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL, DEFAULT_POLLEN_DEADLINE,
+    DEFAULT_RADAR_DEADLINE, DEFAULT_RENDER_DEADLINE,
+    DEFAULT_STALE_DATA_MAX_AGE, DOMAIN, OPTION_DEPRECATED_FORECAST_NOT_USED,
+    RAIN_GRAPH_MAX_WORKERS)
+
+
+def _move_home_to_benelux(hass: HomeAssistant) -> None:
+    hass.states.async_set(ENTITY_ID_HOME, 0, {"latitude": 50.738681639, "longitude": 4.054077148,
+                                              "friendly_name": "test home"})
 
 
 async def test_full_user_flow(
@@ -26,6 +39,7 @@ async def test_full_user_flow(
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": SOURCE_USER}
     )
+    _move_home_to_benelux(hass)
 
     assert result.get("type") == FlowResultType.FORM
     assert result.get("step_id") == "user"
@@ -45,6 +59,27 @@ async def test_full_user_flow(
                                    CONF_LANGUAGE_OVERRIDE: 'none'}
 
 
+async def test_config_flow_checks_the_exact_location(
+        hass: HomeAssistant,
+        mock_setup_entry: MagicMock
+) -> None:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    _move_home_to_benelux(hass)
+
+    with patch("custom_components.irm_kmi.config_flow.IrmKmiApiClient.get_forecasts_coord",
+               return_value={'cityName': 'Brussels'}) as get_forecasts_coord:
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={CONF_ZONE: ENTITY_ID_HOME,
+                        CONF_STYLE: OPTION_STYLE_STD,
+                        CONF_DARK_MODE: False},
+        )
+
+    get_forecasts_coord.assert_called_once_with({'lat': 50.738681639, 'long': 4.054077148})
+
+
 async def test_config_flow_out_benelux_zone(
         hass: HomeAssistant,
         mock_setup_entry: MagicMock,
@@ -53,6 +88,8 @@ async def test_config_flow_out_benelux_zone(
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": SOURCE_USER}
     )
+    # In Benelux according to the outline: the API tells it is out of Benelux
+    _move_home_to_benelux(hass)
 
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
@@ -66,6 +103,27 @@ async def test_config_flow_out_benelux_zone(
     assert CONF_ZONE in result2.get('errors')
 
 
+async def test_config_flow_far_from_benelux_does_not_call_api(
+        hass: HomeAssistant,
+        mock_setup_entry: MagicMock
+) -> None:
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    hass.states.async_set(ENTITY_ID_HOME, 0, {"latitude": 48.856, "longitude": 2.352})
+
+    with patch("custom_components.irm_kmi.config_flow.IrmKmiApiClient.get_forecasts_coord") as get_forecasts_coord:
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input={CONF_ZONE: ENTITY_ID_HOME,
+                        CONF_STYLE: OPTION_STYLE_STD,
+                        CONF_DARK_MODE: False},
+        )
+
+    assert result2.get('errors') == {CONF_ZONE: 'out_of_benelux'}
+    get_forecasts_coord.assert_not_called()
+
+
 async def test_config_flow_with_api_error(
         hass: HomeAssistant,
         mock_setup_entry: MagicMock,
@@ -74,6 +132,7 @@ async def test_config_flow_with_api_error(
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": SOURCE_USER}
     )
+    _move_home_to_benelux(hass)
 
     result2 = await hass.config_entries.flow.async_configure(
         result["flow_id"],
@@ -131,10 +190,33 @@ async def test_option_flow(
         CONF_STYLE: OPTION_STYLE_SATELLITE,
         CONF_DARK_MODE: True,
         CONF_USE_DEPRECATED_FORECAST: OPTION_DEPRECATED_FORECAST_NOT_USED,
-        CONF_LANGUAGE_OVERRIDE: 'none'
+        CONF_LANGUAGE_OVERRIDE: 'none',
+        CONF_STALE_DATA_MAX_AGE: DEFAULT_STALE_DATA_MAX_AGE,
+        CONF_MIN_UPDATE_INTERVAL: DEFAULT_MIN_UPDATE_INTERVAL,
+        CONF_MAX_UPDATE_INTERVAL: DEFAULT_MAX_UPDATE_INTERVAL,
+        CONF_FORECAST_DEADLINE: DEFAULT_FORECAST_DEADLINE,
+        CONF_POLLEN_DEADLINE: DEFAULT_POLLEN_DEADLINE,
+        CONF_RADAR_DEADLINE: DEFAULT_RADAR_DEADLINE,
+        CONF_RENDER_DEADLINE: DEFAULT_RENDER_DEADLINE,
+        CONF_HEDGE_REQUESTS: False,
+        CONF_RENDER_WORKERS: RAIN_GRAPH_MAX_WORKERS
     }
 
 
+async def test_option_flow_rejects_deadline_out_of_range(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id, data=None)
+
+    with pytest.raises(InvalidData):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_FORECAST_DEADLINE: 0}
+        )
+
+
 async def test_config_entry_migration(hass: HomeAssistant) -> None:
     """Ensure that config entry migration takes the configuration to the latest version"""
     entry = MockConfigEntry(
@@ -1,14 +1,26 @@
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+from freezegun import freeze_time
 from homeassistant.components.weather import ATTR_CONDITION_CLOUDY
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.dt import utcnow
 from irm_kmi_api.data import CurrentWeatherData, IrmKmiRadarForecast
 from irm_kmi_api.pollen import PollenParser
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.irm_kmi.const import (DEFAULT_MAX_UPDATE_INTERVAL,
+                                             DEFAULT_MIN_UPDATE_INTERVAL,
+                                             DEFAULT_STALE_DATA_MAX_AGE,
+                                             DEFAULT_UPDATE_INTERVAL)
 from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
 from custom_components.irm_kmi.data import ProcessedCoordinatorData
-from tests.conftest import get_api_data, get_api_with_data
+from custom_components.irm_kmi.sensor import IrmKmiNextWarning
+from tests.conftest import (get_api_data, get_api_with_data,
+                            get_radar_animation_data)
 
 
 async def test_jules_forgot_to_revert_update_interval_before_pushing(
@@ -109,3 +121,200 @@ def test_radar_forecast_rain_interval() -> None:
 
     assert result[12] == _12
     assert result[13] == _13
+
+
+@freeze_time(datetime.fromisoformat('2024-05-30T17:45:00+02:00'))
+async def test_update_interval_shorter_when_rain_is_coming(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    api = get_api_with_data('forecast_with_rain_on_radar.json')
+    data = ProcessedCoordinatorData(radar_forecast=api.get_radar_forecast(), warnings=[])
+
+    assert coordinator.adaptive_update_interval(data) == timedelta(minutes=DEFAULT_MIN_UPDATE_INTERVAL)
+
+
+@freeze_time(datetime.fromisoformat('2024-05-30T17:45:00+02:00'))
+async def test_shortest_interval_does_not_wait_for_radar_publication(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._publication.next_refresh = MagicMock(return_value=timedelta(minutes=10))
+    api = get_api_with_data('forecast_with_rain_on_radar.json')
+    data = ProcessedCoordinatorData(radar_forecast=api.get_radar_forecast(), warnings=[])
+
+    assert coordinator._next_update_interval(data) == timedelta(minutes=DEFAULT_MIN_UPDATE_INTERVAL)
+    coordinator._publication.next_refresh.assert_not_called()
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_update_interval_shorter_when_warning_is_active(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    api = get_api_with_data('be_forecast_warning.json')
+    data = ProcessedCoordinatorData(radar_forecast=[], warnings=api.get_warnings('en'))
+
+    assert coordinator.adaptive_update_interval(data) == timedelta(minutes=DEFAULT_MIN_UPDATE_INTERVAL)
+
+
+async def test_update_interval_longer_when_calm(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    data = ProcessedCoordinatorData(radar_forecast=[], warnings=[])
+
+    assert coordinator.adaptive_update_interval(data) == timedelta(minutes=DEFAULT_MAX_UPDATE_INTERVAL)
+
+    data = ProcessedCoordinatorData(radar_forecast=get_api_with_data('forecast.json').get_radar_forecast(),
+                                    warnings=[])
+
+    assert coordinator.adaptive_update_interval(data) == DEFAULT_UPDATE_INTERVAL
+
+
+async def test_refresh_stages_are_timed(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api._api_data = get_api_data("forecast.json")
+
+    await coordinator.process_api_data()
+
+    assert {'pollen', 'radar', 'pollen_and_radar', 'parse'} <= set(coordinator.stage_durations.keys())
+    assert all(duration >= 0 for duration in coordinator.stage_durations.values())
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_unchanged_sections_are_not_parsed_again(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    api_data = get_api_data("be_forecast_warning.json")
+    coordinator._api._api_data = api_data
+    first = await coordinator.process_api_data()
+
+    coordinator._api._api_data = api_data | {'obs': api_data['obs'] | {'temp': 42}}
+    second = await coordinator.process_api_data()
+
+    assert second['daily_forecast'] is first['daily_forecast']
+    assert second['hourly_forecast'] is first['hourly_forecast']
+    assert second['warnings'] is first['warnings']
+    assert second['current_weather'] is not first['current_weather']
+    assert second['current_weather']['temperature'] == 42
+
+
+async def test_pollen_is_fetched_once_per_day(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api = get_api_with_data("forecast.json")
+    coordinator._api.get_pollen = AsyncMock(return_value={'oak': 'green'})
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00')):
+        coordinator.data = await coordinator.process_api_data()
+        coordinator.data = await coordinator.process_api_data()
+    assert coordinator._api.get_pollen.call_count == 1
+
+    with freeze_time(datetime.fromisoformat('2024-01-13T07:55:00+01:00')):
+        coordinator.data = await coordinator.process_api_data()
+    assert coordinator._api.get_pollen.call_count == 2
+
+
+async def test_rain_graph_is_reused_when_radar_did_not_change(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api = get_api_with_data("forecast.json")
+    coordinator._api.get_pollen = AsyncMock(return_value={})
+    coordinator._api.get_animation_data = MagicMock(side_effect=lambda *args: get_radar_animation_data())
+
+    first = await coordinator.process_api_data()
+    coordinator.data = first
+    second = await coordinator.process_api_data()
+
+    assert second['animation'] is first['animation']
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_stale_data_served_with_its_age_until_max_age(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        mock_exception_irm_kmi_api: AsyncMock
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator.data = ProcessedCoordinatorData(country='BE', warnings=[])
+    coordinator.data_updated_at = utcnow() - timedelta(minutes=10)
+
+    assert await coordinator._async_update_data() is coordinator.data
+    assert coordinator.serving_stale
+
+    warning = IrmKmiNextWarning(coordinator, mock_config_entry)
+    assert warning.extra_state_attributes['data_age'] == 600
+
+    coordinator.data_updated_at = utcnow() - timedelta(minutes=DEFAULT_STALE_DATA_MAX_AGE + 1)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_forecast_missing_its_deadline_serves_stale_data(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._deadlines['forecast'] = 0.01
+
+    async def slow_refresh(*args):
+        await asyncio.sleep(1)
+
+    coordinator._forecast_hub.async_refresh = AsyncMock(side_effect=slow_refresh)
+    coordinator.data = ProcessedCoordinatorData(country='BE', warnings=[], pollen={'oak': 'green'}, stale_sections=[])
+    coordinator.data_updated_at = utcnow() - timedelta(minutes=10)
+
+    result = await coordinator._async_update_data()
+
+    assert result is coordinator.data
+    assert coordinator.serving_stale
+    assert result['stale_sections'] == ['country', 'pollen', 'warnings']
+
+    coordinator.data_updated_at = utcnow() - timedelta(minutes=DEFAULT_STALE_DATA_MAX_AGE + 1)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+async def test_stage_missing_its_deadline_keeps_its_previous_data(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api = get_api_with_data("forecast.json")
+    coordinator._deadlines['pollen'] = 0.01
+    released = asyncio.Event()
+
+    async def slow_pollen():
+        await released.wait()
+        return {'oak': 'green'}
+
+    coordinator._api.get_pollen = slow_pollen
+    coordinator.data = ProcessedCoordinatorData(pollen={'foo': 'bar'}, animation=None)
+
+    result = await coordinator.process_api_data()
+
+    assert result['pollen'] == {'foo': 'bar'}
+    assert result['stale_sections'] == ['pollen']
+    assert result['animation'] is not None
+    assert 'pollen' in coordinator.stage_errors
+
+    # The pollen request shared with the other entries is not cancelled: let it finish
+    released.set()
+    await asyncio.sleep(0)
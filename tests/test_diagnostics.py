@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from irm_kmi_api.api import IrmKmiApiError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.irm_kmi.const import DOMAIN
+from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
+from custom_components.irm_kmi.diagnostics import \
+    async_get_config_entry_diagnostics
+from tests.conftest import get_api_with_data
+
+
+async def test_diagnostics(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api = get_api_with_data("forecast.json")
+
+    async def pollen_error():
+        raise IrmKmiApiError("pollen is down")
+
+    coordinator._api.get_pollen = pollen_error
+    await coordinator.process_api_data()
+    hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert diagnostics['config_entry']['data'] == dict(mock_config_entry.data)
+    assert {'pollen', 'radar', 'parse'} <= set(diagnostics['coordinator']['last_stage_durations'].keys())
+    assert 'pollen is down' in diagnostics['refresh']['stage_errors']['pollen']['error']
+    assert diagnostics['refresh']['animation']['frames'] > 0
+    assert diagnostics['refresh']['caches']['parsed_sections']['misses'] > 0
+
+    del hass.data[DOMAIN]
+
+
+async def test_diagnostics_show_forecast_timeout(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._deadlines['forecast'] = 0.01
+
+    async def slow_refresh(*args):
+        await asyncio.sleep(1)
+
+    coordinator._forecast_hub.async_refresh = AsyncMock(side_effect=slow_refresh)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = coordinator
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert 'no forecast after 0.01 seconds' in diagnostics['refresh']['stage_errors']['forecast']['error']
+
+    del hass.data[DOMAIN]
@@ -0,0 +1,56 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.irm_kmi.frames import IrmKmiFrameCache, IrmKmiFrameStore
+from tests.conftest import get_radar_animation_data
+
+
+def _animation_with_urls(start: int):
+    animation = get_radar_animation_data()
+    for i, frame in enumerate(animation['sequence']):
+        frame['image'] = f"https://example.com/frame_{start + i}.png"
+    animation['location'] = "https://example.com/location.png"
+    return animation
+
+
+async def test_only_new_frames_are_downloaded() -> None:
+    api = MagicMock()
+    api.get_image = AsyncMock(side_effect=lambda url, params=None: url.encode())
+    cache = IrmKmiFrameCache(IrmKmiFrameStore(), lambda: api)
+
+    animation = cache.apply(_animation_with_urls(0))
+    for frame in animation['sequence']:
+        frame['image'] = await cache.get_image(frame['image'])
+    await cache.get_image(animation['location'])
+    assert api.get_image.call_count == 11
+
+    animation = cache.apply(_animation_with_urls(1))
+    assert len(cache) == 10
+    assert [type(f['image']) for f in animation['sequence']] == [bytes] * 9 + [str]
+    assert animation['location'] == b"https://example.com/location.png"
+
+    assert await cache.get_image(animation['sequence'][-1]['image']) == b"https://example.com/frame_10.png"
+    assert api.get_image.call_count == 12
+
+
+async def test_frames_are_shared_between_entries() -> None:
+    api = MagicMock()
+    api.get_image = AsyncMock(side_effect=lambda url, params=None: url.encode())
+    store = IrmKmiFrameStore()
+    first = IrmKmiFrameCache(store, lambda: api)
+    second = IrmKmiFrameCache(store, lambda: api)
+
+    first_animation = first.apply(_animation_with_urls(0))
+    second_animation = second.apply(_animation_with_urls(0))
+    await asyncio.gather(*[cache.get_image(f['image'])
+                           for cache, animation in [(first, first_animation), (second, second_animation)]
+                           for f in animation['sequence']])
+    assert api.get_image.call_count == 10
+
+    # The first entry moved to the next frames: the frame it does not use anymore is still used by the second entry
+    first.apply(_animation_with_urls(1))
+    assert store.get("https://example.com/frame_0.png") is not None
+
+    second.clear()
+    assert store.get("https://example.com/frame_0.png") is None
+    assert store.get("https://example.com/frame_1.png") is not None
@@ -0,0 +1,20 @@
+import pytest
+
+from custom_components.irm_kmi.geofence import is_out_of_benelux
+
+
+@pytest.mark.parametrize("lat,long,expected", [
+    (50.85, 4.35, False),  # Brussels
+    (52.37, 4.90, False),  # Amsterdam
+    (50.63, 5.57, False),  # Liège
+    (53.22, 6.57, False),  # Groningen
+    (48.86, 2.35, True),  # Paris
+    (50.94, 6.96, True),  # Cologne
+    (51.50, -0.12, True),  # London
+    (32.87, -117.23, True),  # San Diego
+    (50.63, 3.06, None),  # Lille, close to the border
+    (50.78, 6.08, None),  # Aachen, close to the border
+    (49.61, 6.13, None),  # Luxembourg, close to the border
+])
+def test_is_out_of_benelux(lat: float, long: float, expected: bool | None) -> None:
+    assert is_out_of_benelux(lat, long) is expected
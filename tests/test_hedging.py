@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from custom_components.irm_kmi.const import HEDGE_MIN_SAMPLES
+from custom_components.irm_kmi.hedging import IrmKmiHedger
+
+
+def _hedger_with_latency(latency: float, max_ratio: float = 1) -> IrmKmiHedger:
+    hedger = IrmKmiHedger(max_ratio=max_ratio, burst=10)
+    hedger.delay = lambda: latency
+    return hedger
+
+
+def test_delay_is_the_usual_latency() -> None:
+    hedger = IrmKmiHedger()
+    hedger._latencies.extend([0.1] * (HEDGE_MIN_SAMPLES - 1))
+    assert hedger.delay() is None
+
+    hedger._latencies.extend([0.1] * (45 - HEDGE_MIN_SAMPLES + 1) + [2] * 5)
+    assert hedger.delay() == pytest.approx(0.1)
+
+    hedger._latencies.append(2)
+    assert hedger.delay() == 2
+
+
+async def test_no_hedging_until_latency_is_known() -> None:
+    hedger = IrmKmiHedger(max_ratio=1, burst=10)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return 'forecast'
+
+    assert hedger.delay() is None
+    assert await hedger.async_call(call) == 'forecast'
+    assert calls == 1
+
+
+async def test_slow_request_is_hedged_and_first_response_wins() -> None:
+    hedger = _hedger_with_latency(0.01)
+    cancelled = []
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        current = calls
+        try:
+            await asyncio.sleep(1 if current == 1 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(current)
+            raise
+        return current
+
+    assert await hedger.async_call(call) == 2
+    await asyncio.sleep(0)
+
+    assert cancelled == [1]
+    assert hedger.stats == {'requests': 1, 'hedged': 1, 'hedge_won': 1}
+
+
+async def test_hedge_waits_for_the_other_request_when_one_fails() -> None:
+    hedger = _hedger_with_latency(0.01)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ValueError("hedge failed")
+        await asyncio.sleep(0.05)
+        return 'primary'
+
+    assert await hedger.async_call(call) == 'primary'
+
+    hedger = _hedger_with_latency(0.01)
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        current = calls
+        await asyncio.sleep(0.05 if current == 1 else 0)
+        raise ValueError(f"request {current} failed")
+
+    # The error of the request sent first is raised
+    with pytest.raises(ValueError, match="request 1 failed"):
+        await hedger.async_call(failing)
+
+
+async def test_extra_requests_are_capped() -> None:
+    hedger = _hedger_with_latency(0.001, max_ratio=0.25)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 'forecast'
+
+    for _ in range(8):
+        await hedger.async_call(call)
+
+    assert hedger.stats['requests'] == 8
+    assert hedger.stats['hedged'] == 2
+    assert calls == 10
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.const import CONF_ZONE
+from homeassistant.core import HomeAssistant
+from irm_kmi_api.api import IrmKmiApiError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.irm_kmi.const import DOMAIN
+from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
+from custom_components.irm_kmi.hub import (IrmKmiDatasetHub, IrmKmiForecastHub,
+                                           get_dataset_hub, get_forecast_hub)
+from tests.conftest import get_api_data, get_api_with_data
+
+
+def _entry_for_zone(mock_config_entry: MockConfigEntry, zone: str) -> MockConfigEntry:
+    return MockConfigEntry(
+        title=zone,
+        domain=DOMAIN,
+        data=mock_config_entry.data | {CONF_ZONE: zone},
+        unique_id=zone,
+    )
+
+
+async def test_coordinators_in_same_cell_share_forecast(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    hass.states.async_set("zone.office", 0, {"latitude": 50.739, "longitude": 4.053})
+
+    first = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.home"))
+    second = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.office"))
+
+    first._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast.json"))
+    second._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast.json"))
+
+    await asyncio.gather(first._async_update_data(), second._async_update_data())
+    await second._async_update_data()
+
+    assert first._api.get_forecasts_coord.call_count + second._api.get_forecasts_coord.call_count == 1
+    # Each coordinator keeps its own client, with the forecast of the cell
+    assert first._api is not second._api
+    assert first._api.get_forecast_data() is second._api.get_forecast_data()
+    assert first._api.get_city() == second._api.get_city() == "Namur"
+
+
+async def test_coordinators_in_different_cells_do_not_share_forecast(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    hass.states.async_set("zone.coast", 0, {"latitude": 51.2, "longitude": 2.9})
+
+    first = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.home"))
+    second = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.coast"))
+
+    first._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast.json"))
+    second._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast_nl.json"))
+
+    await first._async_update_data()
+    await second._async_update_data()
+
+    assert first._api.get_forecasts_coord.call_count == 1
+    assert second._api.get_forecasts_coord.call_count == 1
+    assert first._api is not second._api
+
+
+async def test_coordinator_alone_in_its_cell_gets_its_exact_forecast(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    hass.states.async_set("zone.office", 0, {"latitude": 50.739, "longitude": 4.053})
+
+    first = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.home"))
+    first._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast.json"))
+    await first._async_update_data()
+
+    first._api.get_forecasts_coord.assert_called_once_with({'lat': 50.738681639, 'long': 4.054077148})
+
+    second = IrmKmiCoordinator(hass, _entry_for_zone(mock_config_entry, "zone.office"))
+    second._api.get_forecasts_coord = AsyncMock(return_value=get_api_data("forecast.json"))
+    get_forecast_hub(hass)._cells.clear()
+    await second._async_update_data()
+
+    # Another entry is in the cell: the forecast is fetched for the cell, to be shared
+    second._api.get_forecasts_coord.assert_called_once_with({'lat': 50.74, 'long': 4.05})
+
+
+async def test_forecast_hub_is_shared(hass: HomeAssistant) -> None:
+    assert get_forecast_hub(hass) is get_forecast_hub(hass)
+    assert IrmKmiForecastHub.cell_for(50.738681639, 4.054077148) == IrmKmiForecastHub.cell_for(50.739, 4.053)
+
+
+async def test_pollen_is_fetched_once_for_all_entries(hass: HomeAssistant) -> None:
+    first = get_api_with_data("forecast.json")
+    second = get_api_with_data("forecast.json")
+    first.get_pollen = AsyncMock(return_value={'oak': 'green'})
+    second.get_pollen = AsyncMock(return_value={'oak': 'green'})
+    hub = get_dataset_hub(hass)
+
+    results = await asyncio.gather(hub.async_get_pollen(first), hub.async_get_pollen(second))
+    await hub.async_get_pollen(second)
+
+    assert results[0] == results[1] == {'oak': 'green'}
+    assert first.get_pollen.call_count + second.get_pollen.call_count == 1
+
+
+async def test_failed_pollen_request_is_not_shared(hass: HomeAssistant) -> None:
+    api = get_api_with_data("forecast.json")
+    api.get_pollen = AsyncMock(side_effect=IrmKmiApiError)
+    hub = IrmKmiDatasetHub()
+
+    with pytest.raises(IrmKmiApiError):
+        await hub.async_get_pollen(api)
+
+    api.get_pollen = AsyncMock(return_value={'oak': 'green'})
+    assert await hub.async_get_pollen(api) == {'oak': 'green'}
+
+
+async def test_warnings_are_parsed_once_per_language() -> None:
+    hub = IrmKmiDatasetHub()
+    first = get_api_with_data("be_forecast_warning.json")
+    second = get_api_with_data("be_forecast_warning.json")
+
+    assert hub.get_warnings(first, 'en') is hub.get_warnings(second, 'en')
+    assert hub.get_warnings(first, 'en') is not hub.get_warnings(second, 'fr')
@@ -0,0 +1,71 @@
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from custom_components.irm_kmi.layers import (IrmKmiLayerCache,
+                                              IrmKmiLayerClient)
+
+LOCATION_URL = "https://app.meteo.be/services/appv4/?s=getLocalizationLayerBE&ins=92094&f=2&k={key}&th=n"
+
+
+def _api(image: bytes = b"location") -> MagicMock:
+    api = MagicMock()
+    api.get_image = AsyncMock(return_value=image)
+    return api
+
+
+async def test_layer_is_read_from_disk_after_restart(hass: HomeAssistant, tmp_path) -> None:
+    api = _api()
+    cache = IrmKmiLayerCache(hass, str(tmp_path))
+    assert await cache.async_get_image(LOCATION_URL.format(key="monday"), api) == b"location"
+
+    # After a restart, with the API key of the next day
+    restarted = IrmKmiLayerCache(hass, str(tmp_path))
+    assert await restarted.async_get_image(LOCATION_URL.format(key="tuesday"), api) == b"location"
+
+    assert api.get_image.call_count == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+async def test_least_recently_used_layer_is_evicted(
+        hass: HomeAssistant,
+        tmp_path,
+        monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("custom_components.irm_kmi.layers.LAYER_CACHE_MAX_BYTES", 15)
+    cache = IrmKmiLayerCache(hass, str(tmp_path))
+
+    await cache.async_get_image(LOCATION_URL.replace("92094", "1"), _api(b"first....."))
+    await cache.async_get_image(LOCATION_URL.replace("92094", "2"), _api(b"second...."))
+
+    assert len(os.listdir(tmp_path)) == 1
+    api = _api(b"first.....")
+    await cache.async_get_image(LOCATION_URL.replace("92094", "1"), api)
+    assert api.get_image.call_count == 1
+
+
+async def test_only_static_layers_are_cached(hass: HomeAssistant, tmp_path) -> None:
+    api = _api(b"frame")
+    client = IrmKmiLayerClient(IrmKmiLayerCache(hass, str(tmp_path)), api)
+
+    await client.get_image("https://app.meteo.be/services/appv4/?s=getIncaImage&i=202312261610&f=2&k=abc")
+
+    assert api.get_image.call_count == 1
+    assert not os.path.exists(tmp_path) or len(os.listdir(tmp_path)) == 0
+
+
+async def test_default_directory_is_not_the_index_file(hass: HomeAssistant, tmp_path) -> None:
+    hass.config.config_dir = str(tmp_path)
+    api = _api()
+    assert await IrmKmiLayerCache(hass).async_get_image(LOCATION_URL.format(key="monday"), api) == b"location"
+
+    restarted = IrmKmiLayerCache(hass)
+    assert await restarted.async_get_image(LOCATION_URL.format(key="tuesday"), api) == b"location"
+
+    assert api.get_image.call_count == 1
+    assert len(os.listdir(hass.config.path(STORAGE_DIR, "irm_kmi_layers_images"))) == 1
+    # The index Store writes .storage/irm_kmi_layers: it must not be a directory
+    assert not os.path.isdir(hass.config.path(STORAGE_DIR, "irm_kmi_layers"))
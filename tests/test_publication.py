@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from custom_components.irm_kmi.const import PUBLICATION_GUARD
+from custom_components.irm_kmi.publication import IrmKmiPublicationTracker
+
+CADENCE = timedelta(minutes=10)
+ORIGIN = datetime(2024, 1, 12, 6, 0).astimezone()
+# Frames of a sequence are published this long after the time of its first frame
+DELAY = timedelta(minutes=92, seconds=20)
+
+
+def _frames_at(now: datetime) -> list:
+    """Frame times of the animation received at the given time"""
+    first = ORIGIN + CADENCE * ((now - DELAY - ORIGIN) // CADENCE)
+    return [first + i * CADENCE for i in range(11)]
+
+
+def test_refreshes_converge_right_after_publication() -> None:
+    tracker = IrmKmiPublicationTracker()
+    now = datetime(2024, 1, 12, 9, 3, 17).astimezone()
+    interval, minimum, maximum = timedelta(minutes=7), timedelta(minutes=5), timedelta(minutes=15)
+
+    refreshes = []
+    for _ in range(30):
+        tracker.observe(_frames_at(now), now)
+        now += tracker.next_refresh(now, interval, minimum, maximum)
+        refreshes.append(now)
+
+    # After a few cycles: one refresh per publication, just after it
+    for refresh in refreshes[-10:]:
+        since_publication = (refresh - ORIGIN - DELAY) % CADENCE
+        assert since_publication <= 3 * PUBLICATION_GUARD
+    assert all(b - a == CADENCE for a, b in zip(refreshes[-10:], refreshes[-9:]))
+
+
+def test_no_alignment_before_any_forecast() -> None:
+    tracker = IrmKmiPublicationTracker()
+    assert tracker.next_refresh(datetime.now().astimezone(), timedelta(minutes=7), timedelta(minutes=5),
+                                timedelta(minutes=15)) is None
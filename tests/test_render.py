@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from irm_kmi_api.const import OPTION_STYLE_STD
+from irm_kmi_api.rain_graph import RainGraph
+
+from custom_components.irm_kmi.render import IrmKmiRenderPool, get_render_pool
+from tests.conftest import get_radar_animation_data
+
+
+async def test_rain_graph_is_built_off_the_event_loop(hass: HomeAssistant) -> None:
+    threads = []
+
+    async def build():
+        threads.append(threading.current_thread())
+        return "built"
+
+    rain_graph = MagicMock()
+    rain_graph.build = build
+
+    assert await IrmKmiRenderPool(hass, 1).async_build(lambda: rain_graph) == "built"
+    assert threads[0] is not threading.main_thread()
+
+
+async def test_rain_graph_build_does_no_io(hass: HomeAssistant) -> None:
+    # The API client (and its HTTP session) belongs to the event loop: the build in the worker must not use it
+    api_client = MagicMock()
+    api_client.get_image = AsyncMock(side_effect=AssertionError("image downloaded while building"))
+    api_client.get_svg = AsyncMock(side_effect=AssertionError("SVG downloaded while building"))
+
+    rain_graph = await IrmKmiRenderPool(hass, 1).async_build(
+        lambda: RainGraph(get_radar_animation_data(), country='BE', style=OPTION_STYLE_STD, api_client=api_client))
+
+    assert isinstance(rain_graph, RainGraph)
+    api_client.get_image.assert_not_called()
+    api_client.get_svg.assert_not_called()
+
+
+async def test_rain_graph_build_waiting_for_io_is_refused(hass: HomeAssistant) -> None:
+    async def build():
+        await asyncio.sleep(0.01)
+
+    rain_graph = MagicMock()
+    rain_graph.build = build
+
+    with pytest.raises(RuntimeError):
+        await IrmKmiRenderPool(hass, 1).async_build(lambda: rain_graph)
+
+
+async def test_render_pool_limits_concurrent_builds(hass: HomeAssistant) -> None:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    async def build():
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        # Builds do not wait for I/O: they keep their worker busy
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    rain_graph = MagicMock()
+    rain_graph.build = build
+
+    pool = IrmKmiRenderPool(hass, 2)
+    await asyncio.gather(*[pool.async_build(lambda: rain_graph) for _ in range(5)])
+
+    assert max_running == 2
+
+
+async def test_render_pool_is_shared(hass: HomeAssistant) -> None:
+    assert get_render_pool(hass) is get_render_pool(hass)
+
+
+async def test_render_pool_can_be_resized(hass: HomeAssistant) -> None:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    async def build():
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        # Builds do not wait for I/O: they keep their worker busy
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    rain_graph = MagicMock()
+    rain_graph.build = build
+
+    pool = IrmKmiRenderPool(hass, 1)
+    pool.set_max_workers(3)
+    await asyncio.gather(*[pool.async_build(lambda: rain_graph) for _ in range(6)])
+    assert max_running == 3
+
+    max_running = 0
+    pool.set_max_workers(2)
+    await asyncio.gather(*[pool.async_build(lambda: rain_graph) for _ in range(6)])
+    assert max_running == 2
@@ -0,0 +1,85 @@
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+from irm_kmi_api.api import IrmKmiApiCommunicationError
+from irm_kmi_api.pollen import PollenParser
+from pytest_homeassistant_custom_component.common import (MockConfigEntry,
+                                                          load_fixture)
+
+from custom_components.irm_kmi.api import IrmKmiConditionalApiClient
+from custom_components.irm_kmi.const import IRM_KMI_TO_HA_CONDITION_MAP
+from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
+from tests.replay import (IrmKmiBundle, IrmKmiRecordingSession,
+                          IrmKmiStandInServer, use_stand_in)
+
+FORECAST_URL = 'https://app.meteo.be/services/appv4/'
+POLLEN_URL = 'https://app.meteo.be/services/appv4/?s=getSvg&ins=92094&e=pollen&l=en&k=782832cc606de3bad9b7f2002de4b4b1'
+
+
+def _bundle(directory) -> IrmKmiBundle:
+    bundle = IrmKmiBundle(str(directory))
+    bundle.add(FORECAST_URL, {'s': 'getForecasts', 'k': 'key', 'lat': '50.47', 'long': '4.87'}, 200,
+               {'Content-Type': 'application/json', 'ETag': '"forecast"'}, load_fixture('forecast.json').encode())
+    bundle.add(POLLEN_URL, None, 200, {'Content-Type': 'image/svg+xml'}, load_fixture('pollen.svg').encode())
+    bundle.save()
+    return bundle
+
+
+def _api(session) -> IrmKmiConditionalApiClient:
+    return IrmKmiConditionalApiClient(session=session, user_agent='', cdt_map=IRM_KMI_TO_HA_CONDITION_MAP)
+
+
+async def test_stand_in_replays_the_bundle(tmp_path) -> None:
+    bundle = IrmKmiBundle.load(_bundle(tmp_path).directory)
+
+    async with IrmKmiStandInServer(bundle, chunk_size=1024) as server, aiohttp.ClientSession() as session:
+        api = _api(server.session(session))
+        # Other coordinators get the forecast of the bundle
+        forecast = await api.get_forecasts_coord({'lat': 51.2, 'long': 4.4})
+        assert forecast['cityName'] == 'Namur'
+
+        # The ETag of the bundle is honored
+        assert await api.get_forecasts_coord({'lat': 51.2, 'long': 4.4}) == forecast
+        assert api.http_stats['forecast']['not_modified'] == 1
+
+        assert 'pollen' in await api.get_svg(POLLEN_URL)
+        assert server.requests == 3
+
+
+async def test_stand_in_errors(tmp_path) -> None:
+    async with IrmKmiStandInServer(_bundle(tmp_path), error_rate=1) as server, aiohttp.ClientSession() as session:
+        with pytest.raises(IrmKmiApiCommunicationError):
+            await _api(server.session(session)).get_forecasts_coord({'lat': 50.47, 'long': 4.87})
+
+
+async def test_recorded_bundle_replays_the_same_exchanges(tmp_path) -> None:
+    async with IrmKmiStandInServer(_bundle(tmp_path / 'source')) as server, aiohttp.ClientSession() as session:
+        recorded = IrmKmiBundle(str(tmp_path / 'recorded'))
+        api = _api(IrmKmiRecordingSession(server.session(session), recorded))
+        forecast = await api.get_forecasts_coord({'lat': 50.47, 'long': 4.87})
+        await api.get_svg(POLLEN_URL)
+        recorded.save()
+
+    recorded = IrmKmiBundle.load(str(tmp_path / 'recorded'))
+    assert len(recorded.exchanges) == 2
+    async with IrmKmiStandInServer(recorded) as server, aiohttp.ClientSession() as session:
+        assert await _api(server.session(session)).get_forecasts_coord({'lat': 50.47, 'long': 4.87}) == forecast
+
+
+async def test_coordinator_refreshes_from_the_stand_in(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        tmp_path
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.47, "longitude": 4.87})
+
+    async with IrmKmiStandInServer(_bundle(tmp_path), latency=0.01) as server, aiohttp.ClientSession() as session:
+        use_stand_in(hass, server, session)
+        coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+        # Same path as a scheduled refresh: geofence, deadlines and forecast hub
+        data = await coordinator._async_update_data()
+        await coordinator.async_shutdown()
+
+    assert data['current_weather']['temperature'] is not None
+    assert data['pollen'] != PollenParser.get_unavailable_data()
+    assert data['stale_sections'] == []
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from custom_components.irm_kmi.scheduler import (IrmKmiRateLimiter,
+                                                 IrmKmiScheduler)
+
+
+def test_refreshes_are_spread_within_the_allowed_intervals() -> None:
+    scheduler = IrmKmiScheduler()
+    entries = [f"entry_{i}" for i in range(4)]
+    for entry_id in entries:
+        scheduler.register(entry_id)
+
+    interval = timedelta(minutes=8)
+    minimum, maximum = timedelta(minutes=5), timedelta(minutes=15)
+    delays = [scheduler.stagger(entry_id, interval, minimum, maximum) for entry_id in entries]
+    assert all(minimum <= d <= maximum for d in delays)
+    assert len({round(d.total_seconds()) for d in delays}) == len(entries)
+
+    # At the minimum interval, refreshes are only moved later
+    assert all(scheduler.stagger(entry_id, minimum, minimum, maximum) >= minimum for entry_id in entries)
+
+    scheduler.unregister("entry_1")
+    scheduler.unregister("entry_2")
+    scheduler.unregister("entry_3")
+    assert scheduler.stagger("entry_0", interval, minimum, maximum) == interval
+
+
+def test_phase_of_an_entry_does_not_depend_on_the_others() -> None:
+    scheduler = IrmKmiScheduler()
+    for entry_id in ("entry_0", "entry_1", "entry_2"):
+        scheduler.register(entry_id)
+
+    window = timedelta(minutes=1)
+    with patch('custom_components.irm_kmi.scheduler.random.uniform', return_value=0):
+        before = scheduler.offset("entry_2", window)
+        scheduler.unregister("entry_0")
+        after = scheduler.offset("entry_2", window)
+
+    assert before == after
+    assert timedelta(0) <= after < window
+
+
+async def test_rate_limiter_serves_forecast_first() -> None:
+    limiter = IrmKmiRateLimiter(rate=100, burst=1)
+    await limiter.async_acquire(1)
+
+    order = []
+
+    async def request(name: str, priority: int):
+        await limiter.async_acquire(priority)
+        order.append(name)
+
+    await asyncio.gather(request('radar', 1), request('pollen', 1), request('forecast', 0))
+
+    assert order == ['forecast', 'radar', 'pollen']
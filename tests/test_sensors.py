@@ -9,7 +9,7 @@ from custom_components.irm_kmi import IrmKmiCoordinator
 from custom_components.irm_kmi.binary_sensor import IrmKmiWarning
 from custom_components.irm_kmi.const import CONF_LANGUAGE_OVERRIDE
 from custom_components.irm_kmi.sensor import (IrmKmiNextSunMove,
-                                              IrmKmiNextWarning)
+                                              IrmKmiNextWarning, IrmKmiPollen)
 from tests.conftest import get_api_with_data, get_radar_animation_data
 
 
@@ -218,3 +218,71 @@ async def test_next_sunrise_sunset_bis(
 
     assert datetime.fromisoformat(sunrise.state) == datetime.fromisoformat('2023-12-27T08:44:00+01:00')
     assert datetime.fromisoformat(sunset.state) == datetime.fromisoformat('2023-12-26T16:42:00+01:00')
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_state_written_only_when_changed(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    api = get_api_with_data("be_forecast_warning.json")
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator.data = {'warnings': api.get_warnings('en')}
+
+    warning = IrmKmiWarning(coordinator, mock_config_entry)
+    warning.hass = hass
+    warning.async_write_ha_state = MagicMock()
+
+    warning._handle_coordinator_update()
+    coordinator.data = {'warnings': api.get_warnings('en')}
+    warning._handle_coordinator_update()
+    assert warning.async_write_ha_state.call_count == 1
+
+    coordinator.data = {'warnings': []}
+    warning._handle_coordinator_update()
+    assert warning.async_write_ha_state.call_count == 2
+
+
+async def test_warning_written_when_it_ends_with_the_same_data(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    api = get_api_with_data("be_forecast_warning.json")
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator.data = {'warnings': api.get_warnings('en')}
+
+    warning = IrmKmiWarning(coordinator, mock_config_entry)
+    warning.hass = hass
+    warning.async_write_ha_state = MagicMock()
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T11:55:00+01:00')):
+        warning._handle_coordinator_update()
+    # The attributes do not change the data of the coordinator, compared with the last state written
+    assert 'is_active' not in coordinator.data['warnings'][0]
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T12:05:00+01:00')):
+        warning._handle_coordinator_update()
+    assert warning.async_write_ha_state.call_count == 2
+
+
+async def test_pollen_sensor_only_woken_by_pollen_changes(
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry
+) -> None:
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator.data = {'pollen': {'oak': 'green'}}
+
+    pollen = IrmKmiPollen(coordinator, mock_config_entry, 'oak')
+    pollen.hass = hass
+    pollen.async_write_ha_state = MagicMock()
+    pollen._state_snapshot = MagicMock(wraps=pollen._state_snapshot)
+
+    pollen._handle_coordinator_update()
+    coordinator.changed_datasets = {'current_weather', 'animation'}
+    pollen._handle_coordinator_update()
+    assert pollen._state_snapshot.call_count == 1
+
+    coordinator.data = {'pollen': {'oak': 'red'}}
+    coordinator.changed_datasets = {'pollen'}
+    pollen._handle_coordinator_update()
+    assert pollen.async_write_ha_state.call_count == 2
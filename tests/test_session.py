@@ -0,0 +1,20 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
+
+from custom_components.irm_kmi.session import get_http_session
+
+
+async def test_connections_are_reused(hass: HomeAssistant) -> None:
+    app = web.Application()
+    app.router.add_get('/', lambda request: web.Response(body=b'frame'))
+
+    async with TestServer(app) as server:
+        http_session = get_http_session(hass)
+        for _ in range(3):
+            async with http_session.session.get(server.make_url('/')) as response:
+                assert await response.read() == b'frame'
+
+        assert http_session.stats['connections_opened'] == 1
+        assert http_session.stats['connections_reused'] == 2
+        assert get_http_session(hass) is http_session
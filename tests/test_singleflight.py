@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from irm_kmi_api.api import IrmKmiApiCommunicationError
+
+from custom_components.irm_kmi.singleflight import (IrmKmiSingleFlight,
+                                                    forecast_key)
+
+
+async def test_concurrent_calls_share_the_request() -> None:
+    single_flight = IrmKmiSingleFlight()
+    release = asyncio.Event()
+
+    async def request():
+        await release.wait()
+        return {'cityName': 'Namur'}
+
+    call = AsyncMock(side_effect=request)
+    first = asyncio.create_task(single_flight.async_call(forecast_key(50.47, 4.87), call))
+    second = asyncio.create_task(single_flight.async_call(forecast_key(50.47, 4.87), call))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == await second == {'cityName': 'Namur'}
+    assert call.call_count == 1
+
+    # Result just received: given to the next caller as well
+    assert await single_flight.async_call(forecast_key(50.47, 4.87), call) == {'cityName': 'Namur'}
+    assert call.call_count == 1
+
+
+async def test_result_expires_and_failures_are_not_shared() -> None:
+    single_flight = IrmKmiSingleFlight()
+
+    call = AsyncMock(side_effect=IrmKmiApiCommunicationError("Timeout"))
+    with pytest.raises(IrmKmiApiCommunicationError):
+        await single_flight.async_call(forecast_key(50.47, 4.87), call)
+
+    call = AsyncMock(return_value={'cityName': 'Namur'})
+    await single_flight.async_call(forecast_key(51.22, 4.40), call)
+    await single_flight.async_call(forecast_key(50.47, 4.87), call, ttl=-1)
+    assert call.call_count == 2
+
+    await single_flight.async_call(forecast_key(50.47, 4.87), call)
+    assert call.call_count == 3
+
+
+async def test_validated_forecast_is_kept_for_the_first_refresh() -> None:
+    single_flight = IrmKmiSingleFlight()
+    validation = AsyncMock(return_value={'cityName': 'Namur'})
+    refresh = AsyncMock(return_value={'cityName': 'Namur'})
+
+    with patch('custom_components.irm_kmi.singleflight.SINGLE_FLIGHT_TTL', -1):
+        await single_flight.async_call(forecast_key(50.47, 4.87), validation, ttl=120)
+        assert await single_flight.async_call(forecast_key(50.47, 4.87), refresh) == {'cityName': 'Namur'}
+
+    assert validation.call_count == 1
+    assert refresh.call_count == 0
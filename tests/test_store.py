@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any
+from unittest.mock import AsyncMock
+
+from freezegun import freeze_time
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.irm_kmi.const import DOMAIN, SNAPSHOT_STORAGE_VERSION
+from custom_components.irm_kmi.coordinator import IrmKmiCoordinator
+from custom_components.irm_kmi.data import ProcessedCoordinatorData
+from custom_components.irm_kmi.store import IrmKmiSnapshotStore
+from tests.conftest import get_api_data, get_radar_animation_data
+
+
+def _stored(mock_config_entry: MockConfigEntry,
+            coordinator: IrmKmiCoordinator,
+            data: ProcessedCoordinatorData) -> dict:
+    return {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": IrmKmiSnapshotStore._serialize(coordinator._snapshot_fingerprint(), data, get_radar_animation_data())
+    }
+
+
+@freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00'))
+async def test_restore_saved_data(
+        hass: HomeAssistant,
+        hass_storage: dict[str, Any],
+        mock_config_entry: MockConfigEntry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    coordinator._api._api_data = get_api_data("be_forecast_warning.json")
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = _stored(mock_config_entry, coordinator,
+                                                                     await coordinator.process_api_data())
+
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    assert await coordinator.async_restore_data()
+
+    assert coordinator.data.get('country') == 'BE'
+    assert len(coordinator.data.get('warnings')) == 2
+    assert coordinator.data.get('warnings')[0].get('starts_at') == datetime.fromisoformat('2024-01-12T07:00:00+01:00')
+    assert coordinator.data.get('animation').get_hint() == "Testing SVG camera"
+    assert coordinator.last_update_success_time is not None
+
+
+async def test_ignore_old_or_foreign_saved_data(
+        hass: HomeAssistant,
+        hass_storage: dict[str, Any],
+        mock_config_entry: MockConfigEntry
+) -> None:
+    mock_config_entry.add_to_hass(hass)
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T07:55:00+01:00')):
+        hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = _stored(mock_config_entry, coordinator,
+                                                                         ProcessedCoordinatorData(country='BE'))
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T09:55:00+01:00')):
+        assert not await coordinator.async_restore_data()
+
+    with freeze_time(datetime.fromisoformat('2024-01-12T08:00:00+01:00')):
+        hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"]['data']['fingerprint']['style'] = 'other'
+        assert not await coordinator.async_restore_data()
+
+
+async def test_setup_with_saved_data_does_not_wait_for_api(
+        hass: HomeAssistant,
+        hass_storage: dict[str, Any],
+        mock_config_entry: MockConfigEntry,
+        mock_exception_irm_kmi_api: AsyncMock
+) -> None:
+    hass.states.async_set("zone.home", 0, {"latitude": 50.738681639, "longitude": 4.054077148})
+    mock_config_entry.add_to_hass(hass)
+    coordinator = IrmKmiCoordinator(hass, mock_config_entry)
+    data = ProcessedCoordinatorData(current_weather={}, daily_forecast=[], hourly_forecast=[], radar_forecast=None,
+                                    warnings=[], pollen={}, country='BE')
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = _stored(mock_config_entry, coordinator, data)
+
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert hass.data[DOMAIN][mock_config_entry.entry_id].data.get('country') == 'BE'